@@ -0,0 +1,60 @@
+"""Batch shuffling and dealing with NumPy.
+
+Decks are arrays of card ids (see card.Card.id) with one deck per row.
+Index 0 of a deck is the first card dealt, and cards are dealt one at a
+time in seat rotation, as GameEngine deals from a Deck.
+"""
+
+import numpy as np
+
+from card import CARDS
+from engine import OPENING_CARD
+
+DECK_SIZE = len(CARDS)
+
+_ORDERED_DECK = np.arange(DECK_SIZE, dtype=np.int8)
+
+
+def shuffled_decks(count, rng=None):
+    """A (count, 52) array of independently shuffled decks.
+
+    rng is a numpy.random.Generator, or anything default_rng accepts.
+    """
+    rng = np.random.default_rng(rng)
+    return rng.permuted(np.tile(_ORDERED_DECK, (count, 1)), axis=1)
+
+
+def game_decks(master_seed, game_indices):
+    """A deck for each game index, shuffled from its own stream of master_seed.
+
+    Game N gets the same deck however the indices are split into batches
+    (see seeds.py).
+    """
+    decks = np.empty((len(game_indices), DECK_SIZE), dtype=np.int8)
+    for row, game_index in enumerate(game_indices):
+        seed = np.random.SeedSequence(master_seed, spawn_key=(game_index,))
+        decks[row] = np.random.default_rng(seed).permutation(_ORDERED_DECK)
+    return decks
+
+
+def deal(decks, players=4, sort=True):
+    """Split decks into a (count, players, 52 // players) array of hands.
+
+    Hands are sorted in game order unless sort is False.
+    """
+    if DECK_SIZE % players:
+        raise ValueError(f'{DECK_SIZE} cards cannot be dealt evenly to {players} players')
+    hands = decks.reshape(len(decks), DECK_SIZE // players, players).transpose(0, 2, 1)
+    if sort:
+        return np.sort(hands, axis=2)
+    return np.ascontiguousarray(hands)
+
+
+def opening_seats(hands):
+    """Seat holding the 3 of Clubs in each deal."""
+    return (hands == OPENING_CARD.id).any(axis=2).argmax(axis=1)
+
+
+def to_cards(hand):
+    """Cards of one row of card ids."""
+    return [CARDS[id_] for id_ in hand.tolist()]
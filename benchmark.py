@@ -0,0 +1,285 @@
+"""Benchmarks for the hot paths.
+
+Every case is set up from a fixed seed, warmed up, then timed over several
+repeats; the best repeat gives ops/s. Memory is the peak traced by
+tracemalloc while running a single iteration.
+
+    python benchmark.py                      # run everything
+    python benchmark.py -k verify            # only cases whose name matches
+    python benchmark.py --json after.json --compare before.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from functools import partial
+from itertools import cycle, islice
+
+import combo_table
+import main as cli
+from cache import CombinationCache
+from card import CardPlay, Deck, CARDS, card_func_key
+from engine import GameEngine
+from moves import legal_moves
+from player import Player, ActivePlayer
+from policies import greedy_policy
+from rules import RuleSet
+from validation import verify_combination, is_higher
+
+SEED = 2018
+
+CASES = {}
+
+
+def case(name):
+    """Register a benchmark; the function returns the callable to time.
+
+    A callable that needs fresh state for each call can have a prepare
+    attribute, called with the number of calls before they are timed.
+    """
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+
+def _samples(rng, size, count=256):
+    """Card sets of the given size, half of them valid combinations."""
+    samples = []
+    while len(samples) < count:
+        cards = rng.sample(CARDS, size)
+        if verify_combination(cards)[0] or len(samples) % 2:
+            samples.append(cards)
+    return samples
+
+
+def _verify_case(size, rng):
+    samples = cycle(_samples(rng, size))
+    return lambda: verify_combination(next(samples))
+
+
+for _size in (1, 2, 3, 5):
+    case(f'verify_combination[{_size}]')(partial(_verify_case, _size))
+
+
+@case('cached verify_combination[5]')
+def _cached_verify(rng):
+    cache = CombinationCache(maxsize=1024)
+    samples = cycle(_samples(rng, 5))
+    return lambda: cache.verify_combination(next(samples))
+
+
+# A house variant has no prebuilt table, so its five-card checks are
+# worked out each time; the cache pays off there.
+VARIANT = RuleSet(wrap=True, name='wrap')
+
+
+@case('verify_combination[5] wrap')
+def _variant_verify(rng):
+    samples = cycle(_samples(rng, 5))
+    return lambda: verify_combination(next(samples), VARIANT)
+
+
+@case('cached verify_combination[5] wrap')
+def _cached_variant_verify(rng):
+    cache = CombinationCache(maxsize=1024)
+    samples = cycle(_samples(rng, 5))
+    return lambda: cache.verify_combination(next(samples), VARIANT)
+
+
+@case('is_higher')
+def _is_higher(rng):
+    plays = [CardPlay(verify_combination(cards)[1], cards)
+             for cards in _samples(rng, 5) if verify_combination(cards)[0]]
+    pairs = cycle(zip(plays, reversed(plays)))
+    return lambda: is_higher(*next(pairs))
+
+
+@case('sort_hand')
+def _sort_hand(rng):
+    hands = cycle([rng.sample(CARDS, 13) for _ in range(256)])
+    key = partial(card_func_key, valueby='rank')
+    return lambda: sorted(next(hands), key=key)
+
+
+@case('Deck.build')
+def _deck_build(rng):
+    deck = Deck()
+    return deck.build
+
+
+@case('Deck.shuffle')
+def _deck_shuffle(rng):
+    deck = Deck()
+    return deck.shuffle
+
+
+@case('deal')
+def _deal(rng):
+    names = ('John', 'Jane', 'Jess', 'June')
+
+    def deal():
+        deck = Deck()
+        players = ActivePlayer(*(Player(name) for name in names))
+        while deck.not_empty():
+            players.next_turn().draw(deck)
+    return deal
+
+
+@case('Player.play')
+def _player_play(rng):
+    hands = [rng.sample(CARDS, 13) for _ in range(256)]
+    plays = []
+
+    def prepare(number):
+        # Deal players outside the timer, so only the plays are timed.
+        plays.clear()
+        for hand in islice(cycle(hands), -(-number // 13)):
+            player = Player('John')
+            player.set_hand(hand)
+            plays.extend((player, CardPlay('Single', [card])) for card in hand)
+
+    def play():
+        player, card_play = plays.pop()
+        player.play(card_play)
+    play.prepare = prepare
+    return play
+
+
+@case('legal_moves')
+def _legal_moves(rng):
+    players = []
+    for _ in range(256):
+        player = Player('John')
+        player.set_hand(rng.sample(CARDS, 13))
+        players.append(player)
+    players = cycle(players)
+
+    def moves():
+        for card_play in legal_moves(next(players).index):
+            pass
+    return moves
+
+
+@case('game')
+def _game(rng):
+    names = ('John', 'Jane', 'Jess', 'June')
+
+    def game():
+        engine = GameEngine([Player(name) for name in names])
+        while not engine.is_over():
+            engine.apply(greedy_policy(engine, engine.legal_moves(), rng))
+    return game
+
+
+@case('scripted game')
+def _scripted_game(rng):
+    names = ('John', 'Jane', 'Jess', 'June')
+    lines, _ = cli.greedy_script(SEED, names)
+
+    def game():
+        engine = GameEngine([Player(name) for name in names], rng=SEED)
+        with redirect_stdout(io.StringIO()):
+            cli.play(engine, cli.ScriptReader(lines), strict=True, quiet=True)
+    return game
+
+
+def _time_calls(func, number):
+    prepare = getattr(func, 'prepare', None)
+    if prepare is not None:
+        prepare(number)
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func, min_time=0.2, repeat=5, warmup=0.05):
+    """Time func and return ops/s of the best repeat and peak bytes of one call."""
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        _time_calls(func, 16)
+
+    # Find a number of calls that takes at least min_time.
+    number = 1
+    while True:
+        elapsed = _time_calls(func, number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, _time_calls(func, number))
+
+    prepare = getattr(func, 'prepare', None)
+    if prepare is not None:
+        prepare(1)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops_per_sec': number / best,
+            'ns_per_op': best / number * 1e9,
+            'peak_bytes': peak,
+            'iterations': number}
+
+
+def run(pattern=None, min_time=0.2, repeat=5):
+    # verify_combination[5] is a table lookup when the table is there.
+    table = combo_table.get_table()
+    table_path = None if table is None else table.path
+    print(f'Five-card table: {table_path or "not built"}', file=sys.stderr)
+    results = {}
+    for name, setup in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        rng = random.Random(SEED)
+        random.seed(SEED)
+        results[name] = measure(setup(rng), min_time, repeat)
+        print(f"{name:<36}{results[name]['ops_per_sec']:>14,.0f} ops/s"
+              f"{results[name]['peak_bytes']:>10,} B", file=sys.stderr)
+    return {'seed': SEED,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'combo_table': table_path,
+            'results': results}
+
+
+def compare(current, baseline):
+    if bool(current.get('combo_table')) != bool(baseline.get('combo_table')):
+        print('Only one run had the five-card table; verify_combination[5] is not comparable.')
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before:
+            change = result['ops_per_sec'] / before['ops_per_sec']
+            print(f'{name:<36}{change:>8.2f}x')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', help='only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds per timed repeat')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='print speed-up against a previous JSON result')
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.min_time, args.repeat)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Hands as 52-bit integers.
+
+Bit ``card.id`` is set when the card is in the hand, so each rank takes one
+nibble (bits 4r to 4r+3, Clubs lowest) and the hand keeps game order.
+The rules here mirror those in validation.py but work on masks only.
+"""
+
+from card import CARDS, CARD_RANKS, SUIT
+
+FULL_DECK = (1 << 52) - 1
+
+# All four cards of a rank.
+RANK_MASKS = tuple(0xF << (4 * rank) for rank in range(len(CARD_RANKS)))
+
+# All thirteen cards of a suit, indexed by suit offset.
+SUIT_MASKS = tuple(sum(1 << (4 * rank + offset) for rank in range(len(CARD_RANKS)))
+                   for offset in range(len(SUIT)))
+
+# Lowest bit of every rank nibble.
+_RANK_LOW_BITS = SUIT_MASKS[0]
+
+# Rank presence (see rank_presence) of every five-rank window in CARD_RANKS.
+STRAIGHT_WINDOWS = frozenset(sum(1 << (4 * rank) for rank in range(i, i + 5))
+                             for i in range(len(CARD_RANKS) - 4))
+
+
+def from_cards(cards):
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
+
+
+def to_cards(mask):
+    """Cards of a mask, lowest first."""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(CARDS[low.bit_length() - 1])
+        mask ^= low
+    return cards
+
+
+def popcount(mask):
+    return mask.bit_count()
+
+
+def rank_presence(mask):
+    """Collapse each rank nibble to its lowest bit (set if the rank is present)."""
+    return (mask | mask >> 1 | mask >> 2 | mask >> 3) & _RANK_LOW_BITS
+
+
+def quad_presence(mask):
+    """Lowest bit of each rank nibble that holds all four cards."""
+    return mask & mask >> 1 & mask >> 2 & mask >> 3 & _RANK_LOW_BITS
+
+
+def highest_rank(mask):
+    return (mask.bit_length() - 1) >> 2
+
+
+# Check if cards' combination is valid
+def verify_combination(mask):
+    for rule in (is_single,
+                 is_pair,
+                 is_three_of_a_kind,
+                 is_straight_flush,
+                 is_straight,
+                 is_flush,
+                 is_full_house,
+                 is_four_of_a_kind):
+        valid, name = rule(mask)
+        if valid:
+            return valid, name
+    return False, None
+
+
+def is_single(mask):
+    return popcount(mask) == 1, 'Single'
+
+
+def is_pair(mask):
+    return popcount(mask) == 2 and popcount(rank_presence(mask)) == 1, 'Pair'
+
+
+def is_three_of_a_kind(mask):
+    return popcount(mask) == 3 and popcount(rank_presence(mask)) == 1, 'Three of a kind'
+
+
+def is_straight(mask):
+    return popcount(mask) == 5 and rank_presence(mask) in STRAIGHT_WINDOWS, 'Straight'
+
+
+def is_flush(mask):
+    valid = popcount(mask) == 5 and any(mask & suit_mask == mask for suit_mask in SUIT_MASKS)
+    return valid, 'Flush'
+
+
+def is_full_house(mask):
+    valid = (popcount(mask) == 5 and popcount(rank_presence(mask)) == 2
+             and not quad_presence(mask))
+    return valid, 'Full house'
+
+
+def is_four_of_a_kind(mask):
+    return popcount(mask) == 5 and bool(quad_presence(mask)), 'Four of a kind'
+
+
+def is_straight_flush(mask):
+    valid_straight, _ = is_straight(mask)
+    valid_flush, _ = is_flush(mask)
+    return valid_straight and valid_flush, 'Straight flush'
@@ -0,0 +1,68 @@
+"""Opt-in LRU cache for combination checks.
+
+Card sets are keyed by their bitmask (see bitmask.py), so the same cards
+in any order share one entry. verify_combination results are cached per
+card set, under the rules.RuleSet they were worked out by (see
+rules.RuleSet.key). Comparing plays is left to is_higher: CardPlay already
+carries its strength, so there is nothing worth caching.
+
+    cache = CombinationCache(maxsize=4096)
+    valid, combotype = cache.verify_combination(cards)
+    cache.info()
+"""
+
+from collections import namedtuple, OrderedDict
+
+import validation
+from bitmask import from_cards
+from validation import verify_combination
+
+_MISSING = object()
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class CombinationCache:
+    """Bounded cache of combination checks with least recently used eviction."""
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.info()})'
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, key, compute):
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = self._entries[key] = compute()
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def verify_combination(self, cards, rules=None):
+        if rules is None:
+            rules = validation.DEFAULT_RULES
+        mask = from_cards(cards)
+        if mask.bit_count() != len(cards):
+            # Repeated cards have no canonical key.
+            return verify_combination(cards, rules)
+        return self._lookup((mask, rules.key), lambda: verify_combination(cards, rules))
@@ -1,9 +1,9 @@
 import math
-from random import random
 from collections import namedtuple
 from functools import partial
 
-from colorama import Fore, Back
+import render
+from seeds import as_rng
 
 Suit = namedtuple('Suit', ['name', 'rank', 'uni'])
 diamonds = Suit('Diamonds', 1, b'\xE2\x99\xA6'.decode())
@@ -19,11 +19,50 @@ SUIT = {'Diamonds': diamonds,
 CARD_RANKS = ('3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace', '2')
 
 
+# Precomputed lookup tables. Every card has a canonical id from 0 to 51 so
+# that comparing two ids is the same as comparing the cards in game order:
+#   id = rank index * 4 + suit offset (Clubs 0, Spades 1, Hearts 2, Diamonds 3)
+# 3 of Clubs is 0 and 2 of Diamonds is 51.
+RANK_INDEX = {value: i for i, value in enumerate(CARD_RANKS)}
+SUIT_OFFSET = {name: len(SUIT) - suit.rank for name, suit in SUIT.items()}
+
+
+def card_id(suit, value):
+    return RANK_INDEX[value] * 4 + SUIT_OFFSET[suit]
+
+
 class Card:
+    """A playing card.
+
+    Cards are flyweights: there are exactly 52 instances, built once, and
+    ``Card(suit, value)`` returns the shared instance instead of allocating.
+    """
+
+    __slots__ = ('suit', 'value', 'id')
+
+    _interned = {}
 
-    def __init__(self, suit, value):
-        self.suit = suit
-        self.value = value
+    def __new__(cls, suit, value):
+        try:
+            return cls._interned[suit, value]
+        except KeyError:
+            raise ValueError(f'Unknown card: {value!r} of {suit!r}') from None
+
+    @classmethod
+    def _build(cls, suit, value):
+        card = object.__new__(cls)
+        card.suit = suit
+        card.value = value
+        card.id = card_id(suit, value)
+        cls._interned[suit, value] = card
+        return card
+
+    @classmethod
+    def from_id(cls, id_):
+        return CARDS[id_]
+
+    def __reduce__(self):
+        return self.__class__, (self.suit, self.value)
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self.suit!r}, {self.value!r})'
@@ -31,24 +70,36 @@ class Card:
     def __str__(self):
         return f'{self.value} of {self.suit}'
 
+    def __hash__(self):
+        return self.id
+
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id == other.id
 
     def __ne__(self, other):
-        return not self.__dict__ == other.__dict__
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id != other.id
 
     # Suit ranking: lowest number is equivalent to highest ranking
     # Card values ranking (highest to lowest): 2-A-K-Q-J-10-9...3
+    # Both rankings are folded into the card id.
     def __gt__(self, other):
-        if self.value == other.value:
-            return SUIT[self.suit].rank < SUIT[other.suit].rank  ## Test
-        return CARD_RANKS.index(self.value) > CARD_RANKS.index(other.value)
+        return self.id > other.id
 
-    def show(self, display=True):
-        if self.suit in ['Diamonds', 'Hearts']:
-            fancy_display = f'{Fore.RED}{SUIT[self.suit].uni} {Fore.RESET}{self.value}'
-        else:
-            fancy_display = f'{Fore.BLACK}{Back.WHITE}{SUIT[self.suit].uni} {Back.RESET}{Fore.RESET}{self.value}'
+    def __lt__(self, other):
+        return self.id < other.id
+
+    def __ge__(self, other):
+        return self.id >= other.id
+
+    def __le__(self, other):
+        return self.id <= other.id
+
+    def show(self, display=True, theme=None):
+        fancy_display = render.card(self, theme)
 
         if display:
             print(fancy_display)
@@ -67,22 +118,22 @@ class Deck:
         return len(self._cards)
 
     def build(self):
-        self._cards = []
-        for suit in SUIT.keys():
-            for value in CARD_RANKS:
-                self._cards.append(Card(suit, value))
-        self._cards.sort(key=partial(card_func_key, suit_priority=True))
+        self._cards = list(DECK_ORDER)
+
+    def shuffle(self, rng=None):
+        """Shuffle with rng, a random.Random or a seed for one.
 
-    def shuffle(self):
+        Without rng the random module's shared generator is used.
+        """
+        rng = as_rng(rng)
         # Using Fisher-Yates modern shuffle algorithm
         for i in range(len(self._cards)-1, 0, -1):
-            r = math.floor(random() * (i+1))
+            r = math.floor(rng.random() * (i+1))
             self._cards[i], self._cards[r] = self._cards[r], self._cards[i]
         # Or just the standard random.shuffle()
 
     def _show_cards(self):
-        for card in self._cards:
-            card.show()
+        print(render.cards(self._cards, sep='\n'))
 
     def draw_card(self):
         return self._cards.pop()
@@ -101,34 +152,58 @@ class CardPlay:
                        'Four of a kind': 4,
                        'Straight flush': 5}
 
-    def __init__(self, combotype, cards):
+    def __init__(self, combotype, cards, rules=None):
         self.combotype = combotype
         self.cards = cards
         self.category = combotype.lower() if combotype not in self.five_card_group \
                         else 'five-card'
+        # Plays of the same category compare by strength alone, under the
+        # standard rules unless a rules.RuleSet is given.
+        self.strength = (play_strength if rules is None else rules.play_strength)(combotype, cards)
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self.combotype!r}, {self.cards!r})'
 
     def __str__(self):
-        cards_str = '-'.join(card.show(display=False) for card in self.cards)
-        return f'{self.combotype} of {cards_str}'
+        return render.play(self)
+
+
+# Comparison strength of a five-card combination:
+#   the combination's rank in CardPlay.five_card_group in the high bits, and
+#   in the low six bits what breaks ties within the same combination:
+#     Straight: highest card
+#     Flush, Straight flush: suit, then highest value
+#     Full house, Four of a kind: value of the three or four cards used
+def five_card_strength(combotype, ids):
+    top = max(ids)
+    if combotype == 'Straight':
+        tie_break = top
+    elif combotype in ('Flush', 'Straight flush'):
+        tie_break = (top & 3) * len(CARD_RANKS) + (top >> 2)
+    else:
+        ranks = [i >> 2 for i in ids]
+        tie_break = max(ranks, key=ranks.count)
+    return CardPlay.five_card_group[combotype] << 6 | tie_break
+
+
+# Comparison strength of a play within its category. Singles, pairs and
+# three of a kinds are ranked by their highest card.
+def play_strength(combotype, cards):
+    ids = [card.id for card in cards]
+    if combotype in CardPlay.five_card_group:
+        return five_card_strength(combotype, ids)
+    return max(ids)
 
 
 # Sorting key for cards:
 #   Sort cards by their value(by numerical or by rank) then suit rank by default.
+#   Keys are looked up from tables precomputed per card id.
 def card_func_key(card, valueby='numerical', suit_priority=False):
     if valueby == 'rank':
-        return (CARD_RANKS.index(card.value), -(SUIT[card.suit].rank))
-    else:
-        numerical = CARD_RANKS[11:] + CARD_RANKS[:11]
-        if suit_priority:
-            return (
-                -(SUIT[card.suit].rank), numerical.index(card.value)
-            )
-        return (
-            numerical.index(card.value), -(SUIT[card.suit].rank)
-        )
+        return _RANK_KEYS[card.id]
+    if suit_priority:
+        return _SUIT_PRIORITY_KEYS[card.id]
+    return _NUMERICAL_KEYS[card.id]
 
 
 # An extension of sorting key.
@@ -145,6 +220,22 @@ def group_value(cards):
     return value
 
 
+# The 52 interned cards, indexed by card id.
+CARDS = tuple(sorted((Card._build(suit, value) for suit in SUIT for value in CARD_RANKS),
+                     key=lambda card: card.id))
+
+_NUMERICAL = CARD_RANKS[11:] + CARD_RANKS[:11]
+_RANK_KEYS = tuple((RANK_INDEX[card.value], -(SUIT[card.suit].rank)) for card in CARDS)
+_NUMERICAL_KEYS = tuple((_NUMERICAL.index(card.value), -(SUIT[card.suit].rank)) for card in CARDS)
+_SUIT_PRIORITY_KEYS = tuple((-(SUIT[card.suit].rank), _NUMERICAL.index(card.value)) for card in CARDS)
+
+# Cards by their names as typed in main.py ('<suit> <value>'), in lower case.
+CARD_NAMES = {f'{card.suit} {card.value}'.lower(): card for card in CARDS}
+
+# Order of a freshly built deck.
+DECK_ORDER = tuple(sorted(CARDS, key=partial(card_func_key, suit_priority=True)))
+
+
 if __name__ == '__main__':
     # Pusoy dos (Filipino Poker)
     # Rules:
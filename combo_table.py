@@ -0,0 +1,157 @@
+"""Precomputed classification of every five-card set.
+
+All C(52, 5) sets are classified once with the rules in bitmask.py and
+stored as one unsigned 16-bit entry per set, indexed by the set's
+colexicographic rank (see combination_index). An entry is 0 for a set that
+is not a valid combination, otherwise its five_card_strength, whose high
+bits give the combination type.
+
+The table file is memory-mapped read-only, so every process that opens it
+shares the same pages from the OS page cache instead of building its own
+copy. Build it once with:
+
+    python combo_table.py [path]
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import bitmask
+from card import CardPlay, five_card_strength
+
+MAGIC = b'PDT5'
+_HEADER = struct.Struct('<4sI')
+
+COMBO_SIZE = 5
+TABLE_SIZE = 2598960  # C(52, 5)
+
+DEFAULT_PATH = os.environ.get(
+    'PUSOY_COMBO_TABLE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'five_card_table.bin'))
+
+# BINOM[n][k] == C(n, k) for the ranges needed by combination_index.
+BINOM = tuple(tuple(math.comb(n, k) for k in range(COMBO_SIZE + 1)) for n in range(52))
+
+COMBOTYPES = {group: combotype for combotype, group in CardPlay.five_card_group.items()}
+
+
+def combination_index(ids):
+    """Colexicographic rank of a set of five distinct card ids."""
+    index = 0
+    for k, id_ in enumerate(sorted(ids), 1):
+        index += BINOM[id_][k]
+    return index
+
+
+def classify(mask):
+    valid, combotype = bitmask.verify_combination(mask)
+    if not valid:
+        return 0
+    return five_card_strength(combotype, [card.id for card in bitmask.to_cards(mask)])
+
+
+def classify_all(cards=52):
+    """Entries of every five-card set of the lowest cards card ids, in colex order.
+
+    These are the first C(cards, 5) entries of the table.
+    """
+    entries = array('H', bytes(2 * math.comb(cards, COMBO_SIZE)))
+    index = 0
+    # Nested loops over the highest card first enumerate sets in colex order.
+    for e in range(4, cards):
+        mask_e = 1 << e
+        for d in range(3, e):
+            mask_d = mask_e | 1 << d
+            for c in range(2, d):
+                mask_c = mask_d | 1 << c
+                for b in range(1, c):
+                    mask_b = mask_c | 1 << b
+                    for a in range(b):
+                        entries[index] = classify(mask_b | 1 << a)
+                        index += 1
+    return entries
+
+
+def write(entries, path=DEFAULT_PATH):
+    """Write a table of entries to path, padding it with 0 to TABLE_SIZE entries."""
+    entries = entries + array('H', bytes(2 * (TABLE_SIZE - len(entries))))
+    if sys.byteorder != 'little':
+        entries.byteswap()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, TABLE_SIZE))
+        entries.tofile(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def build(path=DEFAULT_PATH):
+    """Classify every five-card set and write the table to path."""
+    return write(classify_all(), path)
+
+
+class FiveCardTable:
+    """Read-only, memory-mapped view of a built table."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or size != TABLE_SIZE \
+                or len(self._mmap) != _HEADER.size + 2 * TABLE_SIZE:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a five-card table')
+        if sys.byteorder != 'little':
+            self._mmap.close()
+            raise ValueError('Five-card tables are little-endian')
+        self._entries = memoryview(self._mmap)[_HEADER.size:].cast('H')
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path!r})'
+
+    def __len__(self):
+        return len(self._entries)
+
+    def strength(self, ids):
+        return self._entries[combination_index(ids)]
+
+    def verify(self, ids):
+        strength = self.strength(ids)
+        if not strength:
+            return False, None
+        return True, COMBOTYPES[strength >> 6]
+
+    def close(self):
+        self._entries.release()
+        self._mmap.close()
+
+
+_table = None
+_searched = False
+
+
+def load(path=DEFAULT_PATH):
+    """Map the table at path and use it for validation lookups."""
+    global _table, _searched
+    _table = FiveCardTable(path)
+    _searched = True
+    return _table
+
+
+def get_table():
+    """The table in use, mapping DEFAULT_PATH on first call if it exists."""
+    global _table, _searched
+    if not _searched:
+        _searched = True
+        if os.path.exists(DEFAULT_PATH):
+            _table = FiveCardTable(DEFAULT_PATH)
+    return _table
+
+
+if __name__ == '__main__':
+    print('Table written to', build(*sys.argv[1:2]))
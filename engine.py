@@ -0,0 +1,165 @@
+"""Headless game engine.
+
+GameEngine holds the whole state of one game and advances it one move at a
+time. It does no input or output, so the same engine drives the
+interactive game in main.py, simulations and bots.
+
+A move is a CardPlay, or None to pass.
+"""
+
+import copy
+
+import validation
+from card import Card, Deck
+from moves import legal_moves
+from player import ActivePlayer
+from validation import verify_combination, is_higher
+
+OPENING_CARD = Card('Clubs', '3')
+
+PASS = None
+
+
+class IllegalMove(ValueError):
+    """Raised when a move breaks the rules of the current turn."""
+
+
+class GameEngine:
+    """A game of Pusoy Dos between the given players.
+
+    The deck is shuffled with rng (unless one is given; see Deck.shuffle) and
+    dealt in rotation, and the holder of the 3 of Clubs takes the first turn
+    in control of the game.
+    Hands already dealt elsewhere (e.g. by batch.deal) can be given instead,
+    one sequence of cards per player.
+    The game is played by rules, a rules.RuleSet, or validation.DEFAULT_RULES.
+    """
+
+    def __init__(self, players, deck=None, hands=None, rng=None, rules=None):
+        self.rules = validation.DEFAULT_RULES if rules is None else rules
+        self.players = ActivePlayer(*players)
+        if hands is not None:
+            self.deck = None
+            for player, hand in zip(players, hands):
+                for card in hand:
+                    player.take(card)
+        else:
+            if deck is None:
+                deck = Deck()
+                deck.shuffle(rng)
+            self.deck = deck
+            # Deal cards for each player in rotation until there are no cards left in deck.
+            while deck.not_empty():
+                self.players.next_turn().draw(deck)
+
+        self.winners = []
+        # Callables observer(engine, move), told of every move before it is made.
+        self.observers = []
+        self.previous_move = None
+        self.pass_count = 0
+        self.first_turn = True
+        self.move_count = 0
+
+        # Determine the first turn by the player with the lowest card on hand
+        for player in self.players:
+            if OPENING_CARD in player.index:
+                break
+        self.player_in_control = self.current_player = self.players.assign_control(player)
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(turn={self.current_player!r}, '
+                f'previous_move={self.previous_move!r}, pass_count={self.pass_count})')
+
+    def copy(self):
+        """An independent copy of the game, with plain Player copies and no observers."""
+        other = copy.copy(self)
+        other.observers = []
+        players = {player.name: player.copy() for player in self.players}
+        other.winners = [player.copy() for player in self.winners]
+        players.update((player.name, player) for player in other.winners)
+        other.players = self.players.copy(players)
+        other.current_player = players[self.current_player.name]
+        other.player_in_control = players[self.player_in_control.name]
+        return other
+
+    def is_over(self):
+        return self.players.get_size() <= 1
+
+    @property
+    def loser(self):
+        if self.is_over():
+            return self.players.get_first()
+
+    def finishing_order(self):
+        """Players in the order they emptied their hands, loser last."""
+        if self.is_over():
+            return self.winners + [self.loser]
+        return list(self.winners)
+
+    def has_control(self):
+        """Whether the current player may lead with any combination."""
+        return self.previous_move is None or self.player_in_control == self.current_player
+
+    def can_pass(self):
+        return not self.first_turn and not self.has_control()
+
+    def legal_moves(self):
+        """Every legal move for the current player, with PASS last when allowed."""
+        hand = self.current_player.index
+        if self.first_turn:
+            return list(legal_moves(hand, required=OPENING_CARD, rules=self.rules))
+        if self.has_control():
+            return list(legal_moves(hand, rules=self.rules))
+        return list(legal_moves(hand, self.previous_move, rules=self.rules)) + [PASS]
+
+    def check(self, card_play):
+        """Raise IllegalMove unless the current player may make this move."""
+        if self.is_over():
+            raise IllegalMove('The game is over.')
+        if card_play is PASS:
+            if not self.can_pass():
+                raise IllegalMove('Player in control of the game cannot pass.')
+            return
+        hand = self.current_player.index
+        if len(set(card_play.cards)) != len(card_play.cards) \
+                or any(card not in hand for card in card_play.cards):
+            raise IllegalMove("The player doesn't have the card(s).")
+        if self.first_turn and OPENING_CARD not in card_play.cards:
+            raise IllegalMove('Please include 3 of clubs in play as a first turn.')
+        valid, combotype = verify_combination(card_play.cards, self.rules)
+        if not valid or combotype != card_play.combotype:
+            raise IllegalMove('Not a valid combination.')
+        if not self.has_control() and not is_higher(card_play, self.previous_move, self.rules):
+            raise IllegalMove('Wrong card(s). Choose another card(s) to play.')
+
+    def apply(self, card_play):
+        """Make the current player's move and pass the turn on."""
+        self.check(card_play)
+        for observer in self.observers:
+            observer(self, card_play)
+        player = self.current_player
+        if card_play is PASS:
+            self.pass_count += 1
+        else:
+            self.previous_move = player.play(card_play)
+            self.player_in_control = player
+            self.pass_count = 0
+            if player.has_empty_hand():
+                self.winners.append(player)
+                self.players.remove(player)
+        self.first_turn = False
+        self.move_count += 1
+        if not self.is_over():
+            self._next_turn()
+
+    def _next_turn(self):
+        self.current_player = self.players.next_turn()
+        # Everyone else passed: control goes back to the last player who
+        # played, or to the next player if that one has finished.
+        if self.player_in_control not in self.players:
+            responders = self.players.get_size()
+        else:
+            responders = self.players.get_size() - 1
+        if self.pass_count >= responders:
+            self.player_in_control = self.current_player
+            self.pass_count = 0
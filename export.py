@@ -0,0 +1,205 @@
+"""Training data export from self-play.
+
+Every decision of a game becomes one fixed-size record:
+
+    game          game index
+    seat          seat of the player to move
+    hand          card mask of the player's hand (see bitmask.py)
+    unseen        card mask of the cards in the other players' hands
+    prev_category index in moves.CATEGORIES of the play to beat, -1 when leading
+    prev_strength CardPlay.strength of the play to beat, -1 when leading
+    pass_count    passes since the play to beat
+    opponents     cards left of the next seats in turn order, 0 once finished
+    play          card mask of the chosen play, 0 for a pass
+    combotype     gamelog.COMBOTYPE_CODES of the chosen play, 0 for a pass
+    outcome       place the player finished the game in, 1 for first
+
+GameRecorder observes a GameEngine (see GameEngine.observers), so any
+game loop that calls engine.apply, main.py's included, can be recorded.
+A game's records are held until its outcome is known and then copied
+into a RecordWriter, which keeps one chunk of preallocated columns and
+saves each full chunk as an .npz file. Memory stays at one chunk plus
+one game however many games are exported.
+
+    python export.py --games 100000 --out records/
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from bitmask import from_cards
+from engine import GameEngine, PASS
+from gamelog import COMBOTYPE_CODES
+from moves import CATEGORIES
+from player import Player
+from policies import POLICIES
+from seeds import game_rng, new_master_seed
+from simulate import deal_games, seat_policies
+
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+
+def columns(seats=4):
+    """Name, dtype and per-record shape of every record column."""
+    return [('game', np.int64, ()),
+            ('seat', np.int8, ()),
+            ('hand', np.uint64, ()),
+            ('unseen', np.uint64, ()),
+            ('prev_category', np.int8, ()),
+            ('prev_strength', np.int16, ()),
+            ('pass_count', np.int8, ()),
+            ('opponents', np.int8, (seats - 1,)),
+            ('play', np.uint64, ()),
+            ('combotype', np.int8, ()),
+            ('outcome', np.int8, ())]
+
+
+class RecordWriter:
+    """Collect records in chunks of chunk_size and save each chunk to directory."""
+
+    def __init__(self, directory, seats=4, chunk_size=65536, compress=False):
+        self.directory = directory
+        self.seats = seats
+        self.chunk_size = chunk_size
+        self.compress = compress
+        os.makedirs(directory, exist_ok=True)
+        self._columns = {name: np.zeros((chunk_size,) + shape, dtype)
+                         for name, dtype, shape in columns(seats)}
+        self._size = 0
+        self.chunks = 0
+        self.records = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def extend(self, records):
+        """Add records, a dict of equally long sequences by column name."""
+        count = len(records['game'])
+        start = 0
+        while start < count:
+            room = min(self.chunk_size - self._size, count - start)
+            for name, column in self._columns.items():
+                column[self._size:self._size + room] = records[name][start:start + room]
+            self._size += room
+            start += room
+            if self._size == self.chunk_size:
+                self.flush()
+        self.records += count
+
+    def flush(self):
+        """Save the records collected so far as the next chunk."""
+        if not self._size:
+            return
+        path = os.path.join(self.directory, f'chunk-{self.chunks:06d}.npz')
+        save = np.savez_compressed if self.compress else np.savez
+        save(path, **{name: column[:self._size] for name, column in self._columns.items()})
+        self.chunks += 1
+        self._size = 0
+
+    def close(self):
+        self.flush()
+
+
+class GameRecorder:
+    """Record the decisions of one game into a RecordWriter.
+
+    players are the engine's players in seat order. Call finish once the
+    game is over to fill in the outcomes and hand the records over.
+    """
+
+    def __init__(self, writer, engine, players, game=0):
+        if len(players) != writer.seats:
+            raise ValueError(f'Expected {writer.seats} players, got {len(players)}')
+        self.writer = writer
+        self.players = players
+        self.game = game
+        self._seat_of = {player.name: seat for seat, player in enumerate(players)}
+        self._rows = []
+        engine.observers.append(self.observe)
+
+    def observe(self, engine, move):
+        seat = self._seat_of[engine.current_player.name]
+        seats = len(self.players)
+        opponents = [self.players[(seat + offset) % seats] for offset in range(1, seats)]
+        previous_move = None if engine.has_control() else engine.previous_move
+        unseen = 0
+        for opponent in opponents:
+            unseen |= opponent.mask
+        self._rows.append((
+            self.game,
+            seat,
+            engine.current_player.mask,
+            unseen,
+            -1 if previous_move is None else _CATEGORY_CODES[previous_move.category],
+            -1 if previous_move is None else previous_move.strength,
+            engine.pass_count,
+            [opponent.card_count() for opponent in opponents],
+            0 if move is PASS else from_cards(move.cards),
+            0 if move is PASS else COMBOTYPE_CODES[move.combotype]))
+
+    def finish(self, engine):
+        place = {player.name: place for place, player in enumerate(engine.finishing_order(), 1)}
+        outcome = [place[self.players[row[1]].name] for row in self._rows]
+        names = [name for name, _, _ in columns(len(self.players))]
+        records = dict(zip(names, map(list, zip(*self._rows))))
+        records['outcome'] = outcome
+        if self._rows:
+            self.writer.extend(records)
+        self._rows = []
+        engine.observers.remove(self.observe)
+
+
+def load(directory):
+    """Yield the records of every chunk in directory, as dicts of column arrays."""
+    for name in sorted(os.listdir(directory)):
+        if name.startswith('chunk-') and name.endswith('.npz'):
+            with np.load(os.path.join(directory, name)) as chunk:
+                yield {column: chunk[column] for column in chunk.files}
+
+
+def export_games(writer, policy_names, games, seats=4, seed=0, first_game=0):
+    """Play games of self-play between the policies and record every decision."""
+    for game_index in range(first_game, first_game + games):
+        names = seat_policies(policy_names, game_index, seats)
+        players = [Player(f'Seat {seat + 1}') for seat in range(seats)]
+        hands, = deal_games(seed, [game_index], seats)
+        rng = game_rng(seed, game_index)
+        engine = GameEngine(players, hands=hands, rng=rng)
+        recorder = GameRecorder(writer, engine, players, game_index)
+        seat_of = {player.name: seat for seat, player in enumerate(players)}
+        policies = [POLICIES[name] for name in names]
+        while not engine.is_over():
+            seat = seat_of[engine.current_player.name]
+            engine.apply(policies[seat](engine, engine.legal_moves(), rng))
+        recorder.finish(engine)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policies', nargs='+', default=['greedy', 'random'],
+                        choices=sorted(POLICIES))
+    parser.add_argument('--seats', type=int, default=4)
+    parser.add_argument('--out', default='records', help='directory for the chunk files')
+    parser.add_argument('--chunk-size', type=int, default=65536, help='records per chunk')
+    parser.add_argument('--compress', action='store_true')
+    parser.add_argument('--seed', type=int, help='master seed (default: a fresh one)')
+    args = parser.parse_args(argv)
+
+    seed = new_master_seed() if args.seed is None else args.seed
+    start = time.perf_counter()
+    with RecordWriter(args.out, args.seats, args.chunk_size, args.compress) as writer:
+        export_games(writer, args.policies, args.games, args.seats, seed)
+    elapsed = time.perf_counter() - start
+    print(f'Master seed {seed}: {writer.records} records of {args.games} games '
+          f'in {writer.chunks} chunks, {elapsed:.2f}s ({writer.records / elapsed:.0f} records/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Compact binary game logs.
+
+A log file starts with a header, then holds games one after another:
+
+    file header   magic b'PDLG', format version, 3 padding bytes
+    game header   b'G', seed (uint64), number of seats
+                  cards per seat (one byte each), then every card id in seat order
+    move          seat, combotype code, 5 card ids (0xFF when unused)
+    ...
+    end of game   a move record with combotype code END
+
+Moves are fixed-width 7-byte records; combotype code 0 is a pass. Games
+are appended as they are played with GameLogWriter, and GameLogReader
+memory-maps the file and decodes one game at a time. A game cut off by a
+crash is dropped when the log is next opened for writing.
+"""
+
+import mmap
+import struct
+
+from card import CARDS, CardPlay
+from engine import GameEngine, PASS
+from player import Player
+
+MAGIC = b'PDLG'
+VERSION = 1
+
+_FILE_HEADER = struct.Struct('<4sB3x')
+_GAME_HEADER = struct.Struct('<cQB')
+_MOVE = struct.Struct('<BB5B')
+
+GAME_TAG = b'G'
+NO_CARD = 0xFF
+END = 0xFF
+
+COMBOTYPES = ('Single', 'Pair', 'Three of a kind', 'Straight', 'Flush',
+              'Full house', 'Four of a kind', 'Straight flush')
+# Code of each combotype, as stored: 0 is left for no play.
+COMBOTYPE_CODES = {combotype: code for code, combotype in enumerate(COMBOTYPES, 1)}
+
+
+class GameLogWriter:
+    """Append games to a log file, one move at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        size = self._file.tell()
+        if size < _FILE_HEADER.size:
+            self._file.truncate(0)
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+        else:
+            # Appending after an unfinished game would make the games after
+            # it unreadable, so cut the log back to its last complete game.
+            end = _complete_end(path)
+            if end < size:
+                self._file.truncate(end)
+        self._in_game = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_game(self, hands, seed=0):
+        """Begin a game dealt as hands, one sequence of cards per seat."""
+        if self._in_game:
+            raise ValueError('The previous game has not ended.')
+        self._file.write(_GAME_HEADER.pack(GAME_TAG, seed, len(hands)))
+        self._file.write(bytes(len(hand) for hand in hands))
+        self._file.write(bytes(card.id for hand in hands for card in hand))
+        self._in_game = True
+
+    def move(self, seat, card_play):
+        if card_play is PASS:
+            self._file.write(_MOVE.pack(seat, 0, *[NO_CARD] * 5))
+        else:
+            ids = [card.id for card in card_play.cards]
+            ids += [NO_CARD] * (5 - len(ids))
+            self._file.write(_MOVE.pack(seat, COMBOTYPE_CODES[card_play.combotype], *ids))
+
+    def end_game(self):
+        self._file.write(_MOVE.pack(0, END, *[NO_CARD] * 5))
+        self._in_game = False
+
+    def close(self):
+        self._file.close()
+
+
+class LoggedGame:
+    """One game of a log. Moves are decoded when asked for."""
+
+    def __init__(self, buffer, offset):
+        tag, self.seed, seats = _GAME_HEADER.unpack_from(buffer, offset)
+        if tag != GAME_TAG:
+            raise ValueError(f'No game at offset {offset}')
+        offset += _GAME_HEADER.size
+        counts = buffer[offset:offset + seats]
+        offset += seats
+        self.hands = []
+        for count in counts:
+            self.hands.append([CARDS[id_] for id_ in buffer[offset:offset + count]])
+            offset += count
+        self._buffer = buffer
+        self._moves_offset = offset
+        self.move_count = 0
+        while True:
+            if offset + _MOVE.size > len(buffer):
+                raise IndexError('Game ends before its end record')
+            if buffer[offset + 1] == END:
+                break
+            self.move_count += 1
+            offset += _MOVE.size
+        self.end = offset + _MOVE.size
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(seed={self.seed}, moves={self.move_count})'
+
+    def __len__(self):
+        return self.move_count
+
+    def moves(self):
+        """Yield (seat, move) pairs, move being a CardPlay or PASS."""
+        records = self._buffer[self._moves_offset:self._moves_offset + self.move_count * _MOVE.size]
+        for seat, code, *ids in _MOVE.iter_unpack(records):
+            if code == 0:
+                yield seat, PASS
+            else:
+                yield seat, CardPlay(COMBOTYPES[code - 1],
+                                     [CARDS[id_] for id_ in ids if id_ != NO_CARD])
+
+
+class GameLogReader:
+    """Memory-mapped, read-only view of a log file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _FILE_HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a game log')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        """Yield each complete game; a game cut off by a crash ends the iteration."""
+        offset = _FILE_HEADER.size
+        while offset < len(self._mmap):
+            try:
+                game = LoggedGame(self._mmap, offset)
+            except (IndexError, ValueError, struct.error):
+                return
+            yield game
+            offset = game.end
+
+    def close(self):
+        self._mmap.close()
+
+
+def _complete_end(path):
+    """Offset just past the last complete game of the log at path."""
+    end = _FILE_HEADER.size
+    with GameLogReader(path) as reader:
+        for game in reader:
+            end = game.end
+    return end
+
+
+def replay(game, moves=None):
+    """Rebuild a GameEngine from a logged game after its first moves moves.
+
+    Seats are played by Players named 'Seat 1', 'Seat 2', ... in seat order.
+    """
+    players = [Player(f'Seat {seat + 1}') for seat in range(len(game.hands))]
+    engine = GameEngine(players, hands=game.hands)
+    for i, (seat, move) in enumerate(game.moves()):
+        if moves is not None and i >= moves:
+            break
+        if engine.current_player is not players[seat]:
+            raise ValueError(f'Move {i} was made by seat {seat} out of turn')
+        engine.apply(move)
+    return engine
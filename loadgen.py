@@ -0,0 +1,126 @@
+"""Load generator for server.py.
+
+Opens many simulated seats against a running server. Every seat plays
+greedily and joins another table when its game is over, until the run
+time is up. Reports finished games per second and move latency: the time
+from sending a move to seeing it broadcast back.
+
+    python loadgen.py --seats 400 --duration 30
+"""
+
+import argparse
+import asyncio
+import time
+
+from engine import OPENING_CARD, PASS
+from moves import legal_moves
+from server import format_cards, parse_cards, parse_play
+
+
+class Stats:
+
+    def __init__(self):
+        self.games = 0
+        self.moves = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latencies = []
+
+    def percentile(self, fraction):
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+def choose(hand, to_beat, first_turn):
+    """Lowest legal play, or PASS when nothing beats the play to beat."""
+    required = OPENING_CARD if first_turn else None
+    plays = list(legal_moves(hand, to_beat, required))
+    if not plays:
+        return PASS
+    return min(plays, key=lambda card_play: card_play.strength)
+
+
+async def seat(host, port, name, stats, stop_at):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'JOIN {name}\n'.encode())
+    my_seat = None
+    hand = []
+    first_turn = True
+    in_game = False
+    sent_at = None
+    while True:
+        # Stop waiting for a table to fill once the run time is up.
+        timeout = None if in_game else max(stop_at - time.perf_counter(), 0.1)
+        try:
+            raw = await asyncio.wait_for(reader.readline(), timeout)
+        except asyncio.TimeoutError:
+            if time.perf_counter() >= stop_at:
+                break
+            continue
+        if not raw:
+            break
+        kind, *args = raw.decode().split()
+        if kind == 'SEAT':
+            my_seat = int(args[1])
+        elif kind == 'DEAL':
+            hand = parse_cards(args[0])
+            first_turn = True
+            in_game = True
+        elif kind == 'TURN' and int(args[0]) == my_seat:
+            to_beat = None if args[1] == '-' else parse_play(args[1])
+            move = choose(hand, to_beat, first_turn)
+            sent_at = time.perf_counter()
+            writer.write(b'PASS\n' if move is PASS else f'PLAY {format_cards(move.cards)}\n'.encode())
+        elif kind == 'MOVE':
+            first_turn = False
+            if int(args[0]) == my_seat:
+                if sent_at is not None:
+                    stats.latencies.append(time.perf_counter() - sent_at)
+                    sent_at = None
+                stats.moves += 1
+                if args[1] != 'PASS':
+                    for card in parse_cards(args[1]):
+                        hand.remove(card)
+        elif kind == 'TIMEOUT' and int(args[0]) == my_seat:
+            stats.timeouts += 1
+        elif kind == 'ERR':
+            stats.errors += 1
+        elif kind == 'OVER':
+            in_game = False
+            if my_seat == 0:
+                stats.games += 1
+            if time.perf_counter() >= stop_at:
+                break
+            writer.write(f'JOIN {name}\n'.encode())
+        await writer.drain()
+    writer.write(b'QUIT\n')
+    writer.close()
+
+
+async def run(host, port, seats, duration):
+    stats = Stats()
+    start = time.perf_counter()
+    await asyncio.gather(*(seat(host, port, f'Bot{i}', stats, start + duration)
+                           for i in range(seats)))
+    return stats, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load generator for the game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8642)
+    parser.add_argument('--seats', type=int, default=400)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to keep joining')
+    args = parser.parse_args(argv)
+
+    stats, elapsed = asyncio.run(run(args.host, args.port, args.seats, args.duration))
+    print(f'{stats.games} games, {stats.moves} moves in {elapsed:.2f}s '
+          f'({stats.games / elapsed:.1f} games/s, {stats.moves / elapsed:.1f} moves/s)')
+    print(f'{stats.errors} errors, {stats.timeouts} timeouts')
+    if stats.latencies:
+        print('Move latency (ms): ' + ', '.join(
+            f'p{int(q * 100)} {stats.percentile(q) * 1000:.2f}' for q in (0.5, 0.9, 0.99, 1.0)))
+
+
+if __name__ == '__main__':
+    main()
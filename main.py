@@ -1,17 +1,22 @@
-#!/usr/bin/python3.6
+#!/usr/bin/env python3
 
 """pusoy_dos.py
 
 Pusoy Dos or Filipino Poker
 """
 
+import argparse
 import sys
+from contextlib import ExitStack
 from functools import partial
 from pprint import pprint
 
 import card
-from validation import verify_combination, is_higher
-from player import Player, ActivePlayer
+from engine import GameEngine, IllegalMove, OPENING_CARD, PASS
+from moves import greedy_move
+from validation import verify_combination
+from player import Player
+import render
 
 # Pusoy dos (Filipino Poker)
 # Rules:
@@ -26,152 +31,222 @@ from player import Player, ActivePlayer
 #   Four of a kind: 4 cards with equal value plus a single card of any value (Ranked by four cards used)
 #   Straight flush: 5 cards with consecutive values and same suit
 
-# Initialize deck
-deck = card.Deck()
-deck.shuffle()
-
-# Prepare players
-john = Player('John')
-jane = Player('Jane')
-jess = Player('Jess')
-june = Player('June')
-
-# players = [john, jane, jess, june]
-players = ActivePlayer(john, jane, jess, june)
-
-# Deal cards for each player in rotation until there are no cards left in deck.
-while deck.not_empty():
-    players.next_turn().draw(deck)
-
-print('Number of players:', players.get_size())
-print(players)
-
-player_in_control = None
-
-# Determine the first turn by the player with the lowest card on hand
-for player in players:
-    if card.Card('Clubs', '3') in player.hand:
-        player_in_control = players.assign_control(player)
-        break
-
-winners = []
-loser = None
-
-previous_move = None
-
-first_turn = True
-next_turn = False
-pass_ = False
-pass_count = 0
-while players.get_size() > 1:
-    print('\nPlayer size:', players.get_size(), 'Pass count:', pass_count)
-    try:
-        if pass_count == (players.get_size() - 1) or first_turn:
-            if player_in_control not in players:
-                player = players.assign_control(players.get_first())
-            else:
-                player = players.assign_control(player_in_control)
-            print(f"""{f" {player.name}'s turn and control ":#^50}""")
-            pass_count = 0
-        elif next_turn:
-            player = players.next_turn()
-            print(f"""{f" {player.name}'s turn ":#^50}""")
-            next_turn = False
+
+class ScriptError(ValueError):
+    """Raised when a move script has an entry the game does not accept."""
+
+
+class ScriptReader:
+    """Lines of a move script, one entry per line, as pick_move reads them.
+
+    Blank lines and lines starting with # are skipped. EOFError is raised
+    at the end of the script.
+    """
+
+    def __init__(self, lines, name='<script>'):
+        self._lines = iter(lines)
+        self.name = name
+        self.line_number = 0
+
+    def __call__(self):
+        for line in self._lines:
+            self.line_number += 1
+            line = line.strip()
+            if line and not line.startswith('#'):
+                return line
+        raise EOFError
+
+
+def greedy_script(seed, names=('John', 'Jane', 'Jess', 'June')):
+    """Move script of a game dealt with seed and played greedily by every
+    seat (see moves.greedy_move), and the game's loser."""
+    engine = GameEngine([Player(name) for name in names], rng=seed)
+    lines = []
+    while not engine.is_over():
+        move = greedy_move(engine.legal_moves(), engine.has_control())
+        if move is PASS:
+            lines.append('Pass')
         else:
-            print('Something went wrong')
-    except Exception as e:
-        print(e)
+            lines.extend(f'{card_.suit} {card_.value}' for card_ in move.cards)
+            lines.append('Done')
+        engine.apply(move)
+    return lines, engine.loser.name
 
-    print('Cards on hand:', player.card_count())
-    player.sort_hand()
-    player.show_hand()
 
-    picked_cards = []
+def parse_card(text):
+    """Card named by '<suit> <value>' in any case, or None."""
+    return card.CARD_NAMES.get(' '.join(text.lower().split()))
 
-    # Choose cards to form valid combination
-    print('Choose card(s) to form a combination:(<suit> <value>):')
-    while True:
 
-        try:
-            picked_card = input('> ').title()
-            if not picked_card:
-                continue
+def pick_move(engine, player, read=None, strict=False):
+    """Read cards until they form a move the engine accepts.
 
-            if picked_card == 'Quit' or picked_card == 'Q':
-                # Optional exit status for faster bug fixing.
-                sys.exit()
-            elif picked_card == 'Done' or picked_card == 'D':
-                if first_turn and card.Card('Clubs', '3') not in picked_cards:
-                    print('Please include 3 of clubs in play as a first turn. Try again.')
-                    picked_cards = []
-                    continue
-                group_cards = card.group_value(picked_cards)
-                picked_cards.sort(key=partial(card.frequency_counter,
-                                              group_cards=group_cards,
-                                              func=card.card_func_key,
-                                              valueby='rank'))
-                valid, combotype = verify_combination(picked_cards)
-                if valid:
-                    card_play = card.CardPlay(combotype, picked_cards)
-                    if not previous_move or player_in_control == player:
-                        previous_move = player.play(card_play)
-                        next_turn = True
-                        player_in_control = player
-                        if player.has_empty_hand():
-                            print('Player', player.name, 'done')
-                            winners.append(player)
-                            players.remove(player)
-                    else:
-                        if is_higher(card_play, previous_move):
-                            previous_move = player.play(card_play)
-                            next_turn = True
-                            player_in_control = player
-                            if player.has_empty_hand():
-                                print('Player', player.name, 'done')
-                                winners.append(player)
-                                players.remove(player)
-                        else:
-                            print('Wrong card(s). Choose another card(s) to play.')
-                            picked_cards = []
-                            continue
-                else:
-                    pprint(picked_cards)
-                    print('Not a valid combination. Try again.')
-                    picked_cards = []
-                    continue
-                break
-
-            elif picked_card == 'Pass':
-                if first_turn or player_in_control == player:
-                    print('Player in control of the game cannot pass.')
-                else:
-                    pass_ = True
-                    break
-            else:
-                suit, value = picked_card.split()
+    read returns the next entry and defaults to prompting with input().
+    With strict, an entry the game does not accept raises ScriptError
+    instead of asking again.
+    """
+    if not strict:
+        print('Choose card(s) to form a combination:(<suit> <value>):')
+    if read is None:
+        read = partial(input, '> ')
 
-                if suit not in card.SUIT.keys() or value not in card.CARD_RANKS:
-                    print(f"Wrong input.")
-                    continue
+    def reject(message):
+        if strict:
+            raise ScriptError(message)
+        print(message)
 
-                card_ = card.Card(suit, value)
-                if card_ not in player.hand:
-                    print(f"You don't have the card, {card}.")
-                elif card_ in picked_cards:
-                    print(f'{card} is already picked. Choose another one.')
+    picked_cards = []
+    while True:
+        entry = read().strip()
+        command = entry.title()
+        if not entry:
+            continue
+
+        if command == 'Quit' or command == 'Q':
+            # Optional exit status for faster bug fixing.
+            sys.exit()
+        elif command == 'Done' or command == 'D':
+            if engine.first_turn and OPENING_CARD not in picked_cards:
+                reject('Please include 3 of clubs in play as a first turn. Try again.')
+                picked_cards = []
+                continue
+            group_cards = card.group_value(picked_cards)
+            picked_cards.sort(key=partial(card.frequency_counter,
+                                          group_cards=group_cards,
+                                          func=card.card_func_key,
+                                          valueby='rank'))
+            valid, combotype = verify_combination(picked_cards, engine.rules)
+            if not valid:
+                if not strict:
+                    pprint(picked_cards)
+                reject('Not a valid combination. Try again.')
+                picked_cards = []
+                continue
+            card_play = card.CardPlay(combotype, picked_cards, engine.rules)
+            try:
+                engine.check(card_play)
+            except IllegalMove as e:
+                reject(str(e))
+                picked_cards = []
+                continue
+            return card_play
+
+        elif command == 'Pass':
+            if engine.can_pass():
+                return PASS
+            reject('Player in control of the game cannot pass.')
+        else:
+            card_ = parse_card(entry)
+            if card_ is None:
+                reject(f'Wrong input: {entry}')
+            elif card_ not in player.index:
+                reject(f"You don't have the card, {card_}.")
+            elif card_ in picked_cards:
+                reject(f'{card_} is already picked. Choose another one.')
+            else:
+                picked_cards.append(card_)
+
+
+def play(engine, read=None, strict=False, quiet=False):
+    """Run the game loop until the game is over, reading moves with read."""
+    if not quiet:
+        print('Number of players:', engine.players.get_size())
+        print(engine.players)
+
+    while not engine.is_over():
+        player = engine.current_player
+        if not quiet:
+            # Each turn's header and hand go out in one write.
+            with render.Frame() as frame:
+                frame.print('\nPlayer size:', engine.players.get_size(), 'Pass count:', engine.pass_count)
+                if engine.has_control():
+                    frame.print(f"""{f" {player.name}'s turn and control ":#^50}""")
                 else:
-                    picked_cards.append(card)
-        except ValueError:
-            print('Invalid input format.')
+                    frame.print(f"""{f" {player.name}'s turn ":#^50}""")
+
+                frame.print('Cards on hand:', player.card_count())
+                frame.print(render.cards(player.hand))
 
-    print('Card played: ', previous_move)
+        if hasattr(player, 'choose'):
+            # Bots such as mcts.MCTSPlayer pick their own moves.
+            card_play = player.choose(engine)
+        else:
+            card_play = pick_move(engine, player, read, strict)
+        engine.apply(card_play)
+        if not quiet:
+            if card_play is not PASS and player.has_empty_hand():
+                print('Player', player.name, 'done')
+            print('Card played: ', engine.previous_move)
+
+    print('Game over. Loser:', engine.loser.name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pusoy Dos or Filipino Poker')
+    parser.add_argument('--script', metavar='FILE',
+                        help='read moves from FILE (- for stdin), one entry per line, '
+                             'without prompting; read from stdin when it is not a terminal')
+    parser.add_argument('--seed', type=int, help='seed for shuffling the deck')
+    parser.add_argument('--quiet', action='store_true', help='only report the end of the game')
+    parser.add_argument('--record', metavar='FILE',
+                        help='write every entry read to FILE, to be replayed with --script')
+    parser.add_argument('--export', metavar='DIR',
+                        help='save every decision of the game as training records in DIR')
+    args = parser.parse_args(argv)
+
+    # Prepare players
+    john = Player('John')
+    jane = Player('Jane')
+    jess = Player('Jess')
+    june = Player('June')
+
+    engine = GameEngine([john, jane, jess, june], rng=args.seed)
+    if args.export:
+        play_and_export(engine, [john, jane, jess, june], args)
+        return
+    run(engine, args)
+
+
+def play_and_export(engine, players, args):
+    """Run the game, saving its decisions as export.py records."""
+    from export import GameRecorder, RecordWriter
+
+    with RecordWriter(args.export, len(players)) as writer:
+        recorder = GameRecorder(writer, engine, players)
+        run(engine, args)
+        recorder.finish(engine)
+
+
+def run(engine, args):
+    """Run the game reading moves as the command line arguments say."""
+    script = args.script
+    if script is None and not sys.stdin.isatty():
+        script = '-'
+    with ExitStack() as stack:
+        if script is None:
+            reader = partial(input, '> ')
+        else:
+            lines = sys.stdin if script == '-' else stack.enter_context(open(script))
+            reader = ScriptReader(lines, '<stdin>' if script == '-' else script)
+        read = reader
+        if args.record:
+            record = stack.enter_context(open(args.record, 'w'))
+
+            def read():
+                entry = reader()
+                record.write(entry + '\n')
+                return entry
+
+        if script is None:
+            play(engine, read, quiet=args.quiet)
+            return
+        try:
+            play(engine, read, strict=True, quiet=args.quiet)
+        except ScriptError as e:
+            sys.exit(f'{reader.name}:{reader.line_number}: {e}')
+        except EOFError:
+            sys.exit(f'{reader.name}: the script ended before the game was over')
 
-    if pass_:
-        next_turn = True
-        pass_ = False
-        pass_count += 1
-    else:
-        pass_count = 0
-    first_turn = False
 
-print('Game over. Loser:', players.get_last().name)
+if __name__ == '__main__':
+    main()
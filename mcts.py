@@ -0,0 +1,184 @@
+"""Information-set Monte Carlo tree search bot.
+
+Every iteration deals the cards the bot cannot see (its opponents' hands)
+at random, keeping each opponent's hand size, then walks a single tree
+shared by all those determinizations (SO-ISMCTS). Children are picked by
+UCB among the moves legal in the current determinization, counting how
+often each was available, and games are finished with quick greedy
+rollouts. A player scores 1 for finishing first down to 0 for last.
+
+The search is anytime: it runs until its millisecond budget is spent.
+With several workers each runs an independent tree from its own seed and
+their root visit counts are added up.
+"""
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from engine import PASS
+from moves import greedy_move
+from player import Player
+
+
+def move_key(move):
+    """Hashable form of a move that is the same in every determinization."""
+    if move is PASS:
+        return None
+    return tuple(sorted(card.id for card in move.cards))
+
+
+def determinize(engine, observer, rng):
+    """A copy of the game with the cards hidden from observer dealt at random."""
+    state = engine.copy()
+    opponents = [player for player in state.players if player.name != observer]
+    unseen = [card for player in opponents for card in player.hand]
+    rng.shuffle(unseen)
+    start = 0
+    for player in opponents:
+        count = player.card_count()
+        player.set_hand(unseen[start:start + count])
+        start += count
+    return state
+
+
+def rollout_move(state):
+    """Greedy move, as policies.greedy_policy plays."""
+    return greedy_move(state.legal_moves(), state.has_control())
+
+
+def scores(state):
+    """Score of every player by name once the game is over."""
+    order = state.finishing_order()
+    last = len(order) - 1
+    return {player.name: (last - place) / last for place, player in enumerate(order)}
+
+
+class Node:
+    __slots__ = ('mover', 'children', 'visits', 'reward', 'available')
+
+    def __init__(self, mover=None):
+        # Name of the player whose move leads to this node.
+        self.mover = mover
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 1
+
+    def ucb(self, exploration):
+        return (self.reward / self.visits
+                + exploration * math.sqrt(math.log(self.available) / self.visits))
+
+
+def search(engine, budget_ms, seed=None, exploration=0.7, max_iterations=None):
+    """Search from the current player's point of view.
+
+    Returns the visit count of every root move, keyed by move_key.
+    """
+    rng = random.Random(seed)
+    observer = engine.current_player.name
+    root = Node()
+    deadline = time.perf_counter() + budget_ms / 1000
+    iterations = 0
+    # At least one iteration, however small the budget.
+    while not iterations or time.perf_counter() < deadline:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        iterations += 1
+        state = determinize(engine, observer, rng)
+        node = root
+        path = []
+
+        # Selection and expansion
+        while not state.is_over():
+            moves = {move_key(move): move for move in state.legal_moves()}
+            untried = []
+            for key in moves:
+                child = node.children.get(key)
+                if child is None:
+                    untried.append(key)
+                else:
+                    child.available += 1
+            mover = state.current_player.name
+            if untried:
+                key = rng.choice(untried)
+                child = Node(mover)
+                node.children[key] = child
+                path.append(child)
+                state.apply(moves[key])
+                break
+            key, node = max(((key, node.children[key]) for key in moves),
+                            key=lambda item: item[1].ucb(exploration))
+            path.append(node)
+            state.apply(moves[key])
+
+        # Rollout
+        while not state.is_over():
+            state.apply(rollout_move(state))
+
+        # Backpropagation
+        rewards = scores(state)
+        for node in path:
+            node.visits += 1
+            node.reward += rewards[node.mover]
+    return {key: child.visits for key, child in root.children.items()}
+
+
+class MCTSPlayer(Player):
+    """A Player that picks its own moves with ISMCTS.
+
+    budget_ms is the time allowed per move. With workers > 1 the searches
+    run on a pool of processes (or threads with use_threads) created on
+    first use; call close() to shut it down.
+    """
+
+    def __init__(self, name, budget_ms=200, workers=1, use_threads=False,
+                 exploration=0.7, seed=None):
+        super().__init__(name)
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self.use_threads = use_threads
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self._executor = None
+
+    def choose(self, engine):
+        """The move to make on the engine's current turn."""
+        moves = engine.legal_moves()
+        if len(moves) == 1:
+            return moves[0]
+        visits = self.search(engine)
+        best = max(visits, key=visits.get)
+        return next(move for move in moves if move_key(move) == best)
+
+    def search(self, engine):
+        if self.workers <= 1:
+            return search(engine, self.budget_ms, self.rng.getrandbits(64), self.exploration)
+        if self._executor is None:
+            pool = ThreadPoolExecutor if self.use_threads else ProcessPoolExecutor
+            self._executor = pool(max_workers=self.workers)
+        # Workers get a copy made of plain Players.
+        state = engine.copy()
+        futures = [self._executor.submit(search, state, self.budget_ms,
+                                         self.rng.getrandbits(64), self.exploration)
+                   for _ in range(self.workers)]
+        visits = {}
+        for future in futures:
+            for key, count in future.result().items():
+                visits[key] = visits.get(key, 0) + count
+        return visits
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def mcts_policy(engine, moves, rng, budget_ms=20):
+    """Policy form of a single-worker search with a small budget."""
+    if len(moves) == 1:
+        return moves[0]
+    visits = search(engine, budget_ms, rng.getrandbits(64))
+    best = max(visits, key=visits.get)
+    return next(move for move in moves if move_key(move) == best)
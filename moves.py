@@ -0,0 +1,132 @@
+"""Legal move generation.
+
+Plays are built from the hand's rank and suit index (see
+player.HandIndex) instead of testing every subset. Cards inside each
+CardPlay are ordered the way main.py orders a picked play: by group size,
+then by rank. Straights and strengths follow a rules.RuleSet,
+validation.DEFAULT_RULES unless one is given.
+"""
+
+from itertools import combinations, product
+from operator import attrgetter
+
+import validation
+from card import CardPlay
+from player import HandIndex
+
+CATEGORIES = ('single', 'pair', 'three of a kind', 'five-card')
+
+
+def legal_moves(hand, previous_move=None, required=None, rules=None):
+    """Yield every valid CardPlay that can be made from hand.
+
+    hand is a HandIndex or any iterable of cards. With previous_move, only
+    plays of the same category that are higher than it are yielded. With
+    required, only plays containing that card.
+    """
+    if not isinstance(hand, HandIndex):
+        hand = HandIndex(hand)
+    if rules is None:
+        rules = validation.DEFAULT_RULES
+    if previous_move is None:
+        categories, floor = CATEGORIES, -1
+    else:
+        categories = (previous_move.category,)
+        floor = rules.play_strength(previous_move.combotype, previous_move.cards)
+    for category in categories:
+        for card_play in _GENERATORS[category](hand, rules):
+            if card_play.strength <= floor:
+                continue
+            if required is not None and required not in card_play.cards:
+                continue
+            yield card_play
+
+
+def greedy_move(moves, has_control):
+    """Shed as many cards as possible, as cheaply as possible.
+
+    With control, the lowest of the largest plays among moves, otherwise
+    the lowest play; None (engine.PASS) when moves holds no play.
+    """
+    plays = [move for move in moves if move is not None]
+    if not plays:
+        return None
+    if has_control:
+        return min(plays, key=lambda card_play: (-len(card_play.cards), card_play.strength))
+    return min(plays, key=attrgetter('strength'))
+
+
+# Generators take the hand and the rules.RuleSet the plays are made under.
+
+def singles(hand, rules):
+    for card in hand.cards:
+        yield CardPlay('Single', [card], rules)
+
+
+def pairs(hand, rules):
+    for rank in hand.ranks_with(2):
+        for pair in combinations(hand.cards_of_rank(rank), 2):
+            yield CardPlay('Pair', list(pair), rules)
+
+
+def three_of_a_kinds(hand, rules):
+    for rank in hand.ranks_with(3):
+        for triple in combinations(hand.cards_of_rank(rank), 3):
+            yield CardPlay('Three of a kind', list(triple), rules)
+
+
+def five_card_plays(hand, rules):
+    yield from straights(hand, rules)
+    yield from flushes(hand, rules)
+    yield from full_houses(hand, rules)
+    yield from four_of_a_kinds(hand, rules)
+
+
+def straights(hand, rules):
+    """Straights and straight flushes."""
+    for mask, window in rules.straight_windows:
+        if hand.ranks & mask != mask:
+            continue
+        groups = [hand.cards_of_rank(rank) for rank in window]
+        for straight in product(*groups):
+            if all(card.suit == straight[0].suit for card in straight):
+                yield CardPlay('Straight flush', list(straight), rules)
+            else:
+                yield CardPlay('Straight', list(straight), rules)
+
+
+def flushes(hand, rules):
+    """Flushes that are not also straights."""
+    for suit in hand.flush_suits():
+        for flush in combinations(hand.cards_of_suit(suit), 5):
+            ranks = 0
+            for card in flush:
+                ranks |= 1 << (card.id >> 2)
+            if ranks in rules.straight_masks:
+                continue
+            yield CardPlay('Flush', list(flush), rules)
+
+
+def full_houses(hand, rules):
+    pair_ranks = hand.ranks_with(2)
+    for triple_rank in hand.ranks_with(3):
+        for pair_rank in pair_ranks:
+            if pair_rank == triple_rank:
+                continue
+            for triple in combinations(hand.cards_of_rank(triple_rank), 3):
+                for pair in combinations(hand.cards_of_rank(pair_rank), 2):
+                    yield CardPlay('Full house', list(pair + triple), rules)
+
+
+def four_of_a_kinds(hand, rules):
+    for quad_rank in hand.ranks_with(4):
+        quad = hand.cards_of_rank(quad_rank)
+        for kicker in hand.cards:
+            if kicker.id >> 2 != quad_rank:
+                yield CardPlay('Four of a kind', [kicker] + quad, rules)
+
+
+_GENERATORS = {'single': singles,
+               'pair': pairs,
+               'three of a kind': three_of_a_kinds,
+               'five-card': five_card_plays}
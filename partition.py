@@ -0,0 +1,144 @@
+"""Hand partitioning.
+
+Splits a hand into the fewest plays that use every card: singles, pairs,
+three of a kinds and five-card hands, as generated by moves.legal_moves.
+Among splits into equally many plays, the one with the fewest singles,
+then the highest top cards, is preferred.
+
+The split is found by dynamic programming over sub-hands. Sub-hands are
+bitmasks over the hand's own cards (bit i is the i-th lowest card), so a
+13-card hand has 8192 of them. The best split of a sub-hand is one play
+containing its lowest card plus the best split of what is left, and each
+sub-hand is solved once.
+
+Plays and their order follow a rules.RuleSet, validation.DEFAULT_RULES
+unless one is given. Results can be kept in a persistent cache keyed by
+the rules (see rules.RuleSet.key) and the hand's card mask (see
+bitmask.py), which identifies a hand regardless of card order:
+
+    with Planner('partitions.db') as planner:
+        plays = planner.plan(player.hand)
+"""
+
+import dbm
+import json
+from collections import OrderedDict
+
+import validation
+from bitmask import from_cards
+from card import CARDS, CardPlay
+from moves import legal_moves
+from player import HandIndex
+
+
+def _cost(card_play, rules):
+    """Cost of one play; the costs of a split add up and the lowest is best."""
+    return (1, len(card_play.cards) == 1, -max(rules.order_of[card.id] for card in card_play.cards))
+
+
+def partition(hand, rules=None):
+    """Best split of hand (a HandIndex or cards) as a list of CardPlays.
+
+    Plays are in order of their lowest card.
+    """
+    if not isinstance(hand, HandIndex):
+        hand = HandIndex(hand)
+    if rules is None:
+        rules = validation.DEFAULT_RULES
+    bit_of = {card: 1 << i for i, card in enumerate(hand.cards)}
+    # Plays by the bit of their lowest card.
+    plays_from = [[] for _ in hand.cards]
+    for card_play in legal_moves(hand, rules=rules):
+        bits = 0
+        for card in card_play.cards:
+            bits |= bit_of[card]
+        plays_from[(bits & -bits).bit_length() - 1].append((bits, _cost(card_play, rules), card_play))
+
+    best = {0: ((0, 0, 0), None)}
+
+    def solve(sub_hand):
+        solved = best.get(sub_hand)
+        if solved is not None:
+            return solved[0]
+        lowest = (sub_hand & -sub_hand).bit_length() - 1
+        best_cost, best_play = None, None
+        for bits, cost, card_play in plays_from[lowest]:
+            if bits & sub_hand != bits:
+                continue
+            rest = solve(sub_hand ^ bits)
+            total = (cost[0] + rest[0], cost[1] + rest[1], cost[2] + rest[2])
+            if best_cost is None or total < best_cost:
+                best_cost, best_play = total, (bits, card_play)
+        best[sub_hand] = best_cost, best_play
+        return best_cost
+
+    sub_hand = (1 << len(hand.cards)) - 1
+    solve(sub_hand)
+    plays = []
+    while sub_hand:
+        bits, card_play = best[sub_hand][1]
+        plays.append(card_play)
+        sub_hand ^= bits
+    return plays
+
+
+def _encode(plays):
+    return json.dumps([[card_play.combotype, [card.id for card in card_play.cards]]
+                       for card_play in plays]).encode()
+
+
+def _decode(data, rules):
+    return [CardPlay(combotype, [CARDS[id_] for id_ in ids], rules)
+            for combotype, ids in json.loads(data)]
+
+
+class Planner:
+    """partition with an in-memory LRU cache of maxsize hands and, with a
+    path, a persistent dbm cache shared between runs."""
+
+    def __init__(self, path=None, maxsize=4096):
+        self.path = path
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._db = None if path is None else dbm.open(path, 'c')
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path!r}, hits={self.hits}, misses={self.misses})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def plan(self, hand, rules=None):
+        """Best split of hand (a HandIndex or cards) under rules; see partition."""
+        if rules is None:
+            rules = validation.DEFAULT_RULES
+        mask = hand.mask if isinstance(hand, HandIndex) else from_cards(hand)
+        plays = self._memory.get((rules.key, mask))
+        if plays is not None:
+            self.hits += 1
+            self._memory.move_to_end((rules.key, mask))
+            return list(plays)
+        key = f'{rules.key}:{mask:x}'
+        data = None if self._db is None else self._db.get(key)
+        if data is not None:
+            self.hits += 1
+            plays = _decode(data, rules)
+        else:
+            self.misses += 1
+            plays = partition(hand, rules)
+            if self._db is not None:
+                self._db[key] = _encode(plays)
+        self._memory[rules.key, mask] = plays
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+        return list(plays)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,142 +1,211 @@
-from functools import partial
+from bisect import bisect_left, insort
 
-from card import card_func_key
-
-
-class Node:
-
-    def __init__(self, data):
-        self.data = data
-        self.next = None
-
-    def get_data(self):
-        return self.data
-
-    def get_next(self):
-        return self.next
-
-    def set_data(self, new_data):
-        self.data = new_data
-
-    def set_next(self, new_next):
-        self.next = new_next
-
-    def __repr__(self):
-        return f'{self.__class__.__name__}({self.data!r})'
+from bitmask import to_cards, RANK_MASKS, SUIT_MASKS
+from card import CARD_RANKS, SUIT
+import render
 
 
 class ActivePlayer:
     """A class for managing list of players in a continuous cycle
-    or until winner has been decided."""
+    or until winner has been decided.
+
+    Players sit in a fixed array of seats. Active seats are linked in a ring
+    through arrays of next/previous seat indexes and a map from player name
+    to seat, so taking turns, removing a player, handing over control and
+    membership are all constant time.
+    """
 
     def __init__(self, *players):
+        self._seats = []
+        self._next = []
+        self._prev = []
+        self._seat_of = {}
         self._first = None
-        self._last = None
         self._turn = None
         self._size = 0
         self.set(*players)
 
     def __repr__(self):
-        current = self._first
-        player_objs = []
-        for i in range(self._size):
-            player_objs.append(current.get_data())
-            current = current.get_next()
-        return f"{self.__class__.__name__}({', '.join(map(str, player_objs))})"
+        return f"{self.__class__.__name__}({', '.join(map(str, self))})"
 
     def __str__(self):
-        current = self._first
         _players = []
-        for i in range(self._size):
-            _players.append(f'Player {i+1}: {current.get_data().name}')
-            current = current.get_next()
+        for i, player in enumerate(self):
+            _players.append(f'Player {i+1}: {player.name}')
         return '\n'.join(_players)
 
-    def __iter__(self):
-        self._turn = None
-        return self
+    def __len__(self):
+        return self._size
 
-    def __next__(self):
-        if self._turn:
-            self._turn = self._turn.get_next()
-            if not self._turn:
-                raise StopIteration
+    def __iter__(self):
+        seat = self._first
+        for _ in range(self._size):
+            yield self._seats[seat]
+            seat = self._next[seat]
+
+    def __contains__(self, player):
+        return player.name in self._seat_of
+
+    def __copy__(self):
+        return self.copy()
+
+    def copy(self, replace=None):
+        """A ring with the same players, seats and turn.
+
+        replace maps player names to the players that take those seats in
+        the copy.
+        """
+        other = self.__class__.__new__(self.__class__)
+        if replace:
+            other._seats = [replace.get(player.name, player) for player in self._seats]
         else:
-            self._turn = self._first
-        return self._turn.get_data()
+            other._seats = list(self._seats)
+        other._next = list(self._next)
+        other._prev = list(self._prev)
+        other._seat_of = dict(self._seat_of)
+        other._first = self._first
+        other._turn = self._turn
+        other._size = self._size
+        return other
 
     def set(self, *players):
-        if players:
-            for player in players:
-                node = Node(player)
-                if self._last:
-                    self._last.set_next(node)
-                else:
-                    self._first = node
-                self._last = node
-                self._size += 1
-            # self._last.set_next(self._first)
+        for player in players:
+            self.add(player)
 
     def add(self, player):
-        node = Node(player)
-        self._last.set_next(node)
-        node.set_next(self._first)
-        self._last = node
+        seat = len(self._seats)
+        self._seats.append(player)
+        self._seat_of[player.name] = seat
+        if self._first is None:
+            self._first = seat
+            self._next.append(seat)
+            self._prev.append(seat)
+        else:
+            last = self._prev[self._first]
+            self._next.append(self._first)
+            self._prev.append(last)
+            self._next[last] = seat
+            self._prev[self._first] = seat
         self._size += 1
 
     def next_turn(self):
-        if self._turn:
-            turn = self._turn.get_next()
-            self._turn = turn if turn else self._first
-        else:
+        if self._turn is None:
             self._turn = self._first
-        return self._turn.get_data()
+        else:
+            self._turn = self._next[self._turn]
+        return self._seats[self._turn]
 
     def assign_control(self, player):
         self._turn = self.search(player)
-        return self._turn.get_data()
+        return self._seats[self._turn]
 
     def search(self, player):
-        # Test the correctness of method
-        current = self._first
-        found = False
-        while not found:
-            if current.get_data() == player:
-                found = True
-            else:
-                current = current.get_next()
-        return current
+        """Seat index of an active player."""
+        return self._seat_of[player.name]
 
     def remove(self, player):
-        # Somehow needs to return a value indicating that a value has been
-        # removed
-        current = self._first
-        previous = None
-        found = False
-        while not found:
-            if current.get_data() == player:
-                self._size -= 1
-                found = True
-            else:
-                previous = current
-                current = current.get_next()
-        if not previous:
-            self._first = current.get_next()
-            self._last.set_next(self._first)
-        else:
-            if self._last == current:
-                self._last = previous
-            previous.set_next(current.get_next())
-        return found
+        seat = self._seat_of.pop(player.name, None)
+        if seat is None:
+            return False
+        self._size -= 1
+        previous, next_ = self._prev[seat], self._next[seat]
+        self._next[previous] = next_
+        self._prev[next_] = previous
+        if self._first == seat:
+            self._first = next_ if self._size else None
+        if self._turn == seat:
+            # The next turn goes to the player after the removed one.
+            self._turn = previous if self._size else None
+        return True
 
     def get_size(self):
         return self._size
 
     def get_first(self):
-        return self._first
+        if self._first is not None:
+            return self._seats[self._first]
 
     def get_last(self):
-        return self._last
+        if self._first is not None:
+            return self._seats[self._prev[self._first]]
+
+
+class HandIndex:
+    """Cards of a hand kept sorted in game order, with per-rank counts and
+    per-suit rank masks updated card by card as cards come and go."""
+
+    __slots__ = ('cards', 'mask', 'rank_counts', 'suit_ranks', 'ranks')
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.mask = 0
+        self.rank_counts = [0] * len(CARD_RANKS)
+        # Bit r of suit_ranks[suit offset] and of ranks is set when rank r is held.
+        self.suit_ranks = [0] * len(SUIT)
+        self.ranks = 0
+        for card in cards:
+            self.add(card)
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls(to_cards(mask))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.cards!r})'
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __contains__(self, card):
+        return bool(self.mask >> card.id & 1)
+
+    def copy(self):
+        other = HandIndex.__new__(HandIndex)
+        other.cards = list(self.cards)
+        other.mask = self.mask
+        other.rank_counts = list(self.rank_counts)
+        other.suit_ranks = list(self.suit_ranks)
+        other.ranks = self.ranks
+        return other
+
+    def add(self, card):
+        insort(self.cards, card)
+        rank = card.id >> 2
+        self.mask |= 1 << card.id
+        self.rank_counts[rank] += 1
+        self.suit_ranks[card.id & 3] |= 1 << rank
+        self.ranks |= 1 << rank
+
+    def remove(self, card):
+        """Remove card, returning False if it is not in the hand."""
+        if card not in self:
+            return False
+        self.cards.pop(bisect_left(self.cards, card))
+        rank = card.id >> 2
+        self.mask &= ~(1 << card.id)
+        self.rank_counts[rank] -= 1
+        self.suit_ranks[card.id & 3] &= ~(1 << rank)
+        if not self.rank_counts[rank]:
+            self.ranks &= ~(1 << rank)
+        return True
+
+    def ranks_with(self, count):
+        """Ranks held at least count times, lowest first."""
+        return [rank for rank, held in enumerate(self.rank_counts) if held >= count]
+
+    def cards_of_rank(self, rank):
+        return to_cards(self.mask & RANK_MASKS[rank])
+
+    def cards_of_suit(self, suit):
+        """Cards of a suit, given by its offset (Clubs 0 to Diamonds 3)."""
+        return to_cards(self.mask & SUIT_MASKS[suit])
+
+    def flush_suits(self):
+        """Suit offsets with at least five cards."""
+        return [suit for suit, ranks in enumerate(self.suit_ranks) if ranks.bit_count() >= 5]
 
 
 class Player:
@@ -144,7 +213,7 @@ class Player:
 
     def __init__(self, name):
         self.name = name
-        self.hand = []
+        self.index = HandIndex()
         Player.count += 1
 
     def __eq__(self, other):
@@ -153,43 +222,64 @@ class Player:
     def __repr__(self):
         return f'{self.__class__.__name__}({self.name!r})'
 
+    # The hand is always sorted in game order (see sort_hand). It is read-only:
+    # cards come and go through take, play and set_hand, which keep the index.
+    @property
+    def hand(self):
+        return tuple(self.index.cards)
+
+    @hand.setter
+    def hand(self, cards):
+        self.set_hand(cards)
+
+    @property
+    def mask(self):
+        """52-bit mask of the cards in hand (bit n is the card with id n)"""
+        return self.index.mask
+
+    def copy(self):
+        """A plain Player with the same name and a copy of the hand."""
+        other = Player.__new__(Player)
+        other.name = self.name
+        other.index = self.index.copy()
+        return other
+
     def draw(self, deck):
         if deck.not_empty():
-            self.hand.append(deck.draw_card())
+            self.take(deck.draw_card())
+
+    def take(self, card):
+        self.index.add(card)
+
+    def set_hand(self, cards):
+        self.index = HandIndex(cards)
 
     def show_hand(self):
-        cards = []
-        for i, card in enumerate(self.hand):
-            cards.append(card.show(display=False))
-        print('-'.join(cards))
+        print(render.cards(self.hand))
 
     def play(self, card_play):
-        # cards = sorted(cards, key=partial(card_func_key, valueby='rank'))
         for card in card_play.cards:
-            self.hand.pop(self.hand.index(card))
+            if not self.index.remove(card):
+                raise ValueError(f"{self.name} doesn't have the card, {card}.")
         return card_play
 
     def discard(self, card):
-        if card in self.hand:
-            self.hand.pop(self.hand.index(card))
+        self.index.remove(card)
 
     def sort_hand(self):
-        self.hand.sort(key=partial(card_func_key, valueby='rank'))
+        # The index keeps the hand sorted by rank as cards come and go.
+        pass
 
     def card_count(self):
-        return len(self.hand)
+        return len(self.index)
 
     def has_empty_hand(self):
-        return not self.hand
+        return not self.index.cards
 
 
 if __name__ == '__main__':
     from card import Deck
 
-    """Reference: Implementing an Unordered List: Linked Lists
-    http://interactivepython.org/courselib/static/pythonds/BasicDS/ImplementinganUnorderedListLinkedLists.html
-    """
-
     deck = Deck()
     deck.shuffle()
 
@@ -0,0 +1,56 @@
+"""Bot policies.
+
+A policy picks a move for the engine's current player:
+
+    policy(engine, moves, rng) -> move
+
+where moves is engine.legal_moves() and rng a random.Random instance.
+Policies are plain module-level functions so they can be sent to worker
+processes by name through POLICIES.
+"""
+
+from operator import attrgetter
+
+from engine import PASS
+from mcts import mcts_policy
+from moves import greedy_move
+from partition import Planner
+
+_planner = Planner()
+
+
+def random_policy(engine, moves, rng):
+    return rng.choice(moves)
+
+
+def greedy_policy(engine, moves, rng):
+    """Shed as many cards as possible, as cheaply as possible.
+
+    Leads with the lowest of the largest combinations and otherwise answers
+    with the lowest play that beats the previous move.
+    """
+    return greedy_move(moves, engine.has_control())
+
+
+def planner_policy(engine, moves, rng):
+    """Play the hand as split by partition.Planner.
+
+    Leads the play holding the lowest card and otherwise answers with the
+    lowest play of the split that beats the previous move, or greedily when
+    none does.
+    """
+    plan = _planner.plan(engine.current_player.index, engine.rules)
+    playable = {(move.combotype, frozenset(move.cards)): move for move in moves if move is not PASS}
+    plays = [playable[key] for key in ((card_play.combotype, frozenset(card_play.cards))
+                                       for card_play in plan) if key in playable]
+    if engine.has_control():
+        return plays[0] if plays else greedy_policy(engine, moves, rng)
+    if plays:
+        return min(plays, key=attrgetter('strength'))
+    return greedy_policy(engine, moves, rng)
+
+
+POLICIES = {'random': random_policy,
+            'greedy': greedy_policy,
+            'mcts': mcts_policy,
+            'planner': planner_policy}
@@ -0,0 +1,107 @@
+"""Card rendering for the terminal.
+
+The rendering of each of the 52 cards is built once per theme and kept in
+a table indexed by card id, so showing a hand only joins cached strings:
+
+    color   suit symbol on a colored background, via colorama
+    plain   suit symbol and value, no escape codes
+    ascii   suit initial and value, for terminals without unicode
+
+colorama is only imported the first time the color theme is rendered.
+Setting the PUSOY_THEME environment variable (e.g. to plain) or calling
+set_theme picks the default theme; headless processes that never render
+never import colorama at all.
+
+Frame collects the output of one screen update and writes it at once:
+
+    with Frame() as frame:
+        frame.print('Cards on hand:', player.card_count())
+        frame.print(render.cards(player.hand))
+"""
+
+import os
+import sys
+
+THEMES = ('color', 'plain', 'ascii')
+
+_theme = os.environ.get('PUSOY_THEME', 'color')
+_tables = {}
+
+
+def set_theme(theme):
+    """Make theme the default for every rendering that does not name one."""
+    global _theme
+    if theme not in THEMES:
+        raise ValueError(f'Unknown theme {theme!r}, expected one of {THEMES}')
+    _theme = theme
+
+
+def get_theme():
+    return _theme
+
+
+def _build(theme):
+    from card import CARDS, SUIT
+
+    if theme == 'color':
+        from colorama import Fore, Back
+
+        def render(card):
+            if card.suit in ('Diamonds', 'Hearts'):
+                return f'{Fore.RED}{SUIT[card.suit].uni} {Fore.RESET}{card.value}'
+            return f'{Fore.BLACK}{Back.WHITE}{SUIT[card.suit].uni} {Back.RESET}{Fore.RESET}{card.value}'
+    elif theme == 'plain':
+        def render(card):
+            return f'{SUIT[card.suit].uni} {card.value}'
+    elif theme == 'ascii':
+        def render(card):
+            return f'{card.suit[0]} {card.value}'
+    else:
+        raise ValueError(f'Unknown theme {theme!r}, expected one of {THEMES}')
+    return tuple(render(card) for card in CARDS)
+
+
+def table(theme=None):
+    """Renderings of all 52 cards in a theme, indexed by card id."""
+    theme = theme or _theme
+    rendered = _tables.get(theme)
+    if rendered is None:
+        rendered = _tables[theme] = _build(theme)
+    return rendered
+
+
+def card(card_, theme=None):
+    return table(theme)[card_.id]
+
+
+def cards(cards_, sep='-', theme=None):
+    rendered = table(theme)
+    return sep.join([rendered[card_.id] for card_ in cards_])
+
+
+def play(card_play, theme=None):
+    return f'{card_play.combotype} of {cards(card_play.cards, theme=theme)}'
+
+
+class Frame:
+    """Output of one screen update, written to stream in a single write."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._parts = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def print(self, *objects, sep=' ', end='\n'):
+        self._parts.append(sep.join(map(str, objects)) + end)
+
+    def flush(self):
+        if self._parts:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(self._parts))
+            stream.flush()
+            self._parts.clear()
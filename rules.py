@@ -0,0 +1,203 @@
+"""Rule sets for house variants.
+
+A RuleSet names the card order and the five-card hierarchy of a variant
+and is compiled once into lookup tables indexed by card id (see
+card.Card.id), so checking and comparing plays under any variant is
+table lookups only:
+
+    rank_of, suit_of   position of each card's value and suit, lowest 0
+    order_of           each card's place in the variant's card order
+    rank_bits          1 << rank_of, to build a 13-bit mask of the ranks in a play
+    straight_tops      rank mask of every straight -> rank of its top card
+    straight_windows   (mask, ranks) in card.id >> 2 ranks of every straight, lowest
+                       first, for move generation on a player.HandIndex
+    five_card_group    rank of each five-card combination, lowest 1
+
+Straights are five consecutive ranks. With wrap, runs continue from the
+highest rank to the lowest (e.g. Ace 2 3 4 5), ranked by their last card.
+Without two_in_straight, no straight holds a card of value '2'.
+
+STANDARD is the game as played in main.py. validation.py, moves.py and
+GameEngine play by validation.DEFAULT_RULES unless given another RuleSet.
+"""
+
+from hashlib import blake2b
+
+from card import CARDS, CARD_RANKS, CardPlay, SUIT_OFFSET, play_strength
+
+STANDARD_SUITS = tuple(sorted(SUIT_OFFSET, key=SUIT_OFFSET.get))
+STANDARD_FIVE_CARD_ORDER = tuple(sorted(CardPlay.five_card_group, key=CardPlay.five_card_group.get))
+
+# Which neighbours of five sorted ranks are equal -> combination of a
+# full house or four of a kind; the middle rank is that of the three or four.
+_GROUP_SHAPES = {(True, False, True, True): 'Full house',
+                 (True, True, False, True): 'Full house',
+                 (True, True, True, False): 'Four of a kind',
+                 (False, True, True, True): 'Four of a kind'}
+
+
+class RuleSet:
+    """A compiled variant; orders are given from lowest to highest."""
+
+    def __init__(self, rank_order=CARD_RANKS, suit_order=STANDARD_SUITS,
+                 five_card_order=STANDARD_FIVE_CARD_ORDER, wrap=False, two_in_straight=True,
+                 name='custom'):
+        if sorted(rank_order) != sorted(CARD_RANKS):
+            raise ValueError(f'rank_order must order {CARD_RANKS}')
+        if sorted(suit_order) != sorted(STANDARD_SUITS):
+            raise ValueError(f'suit_order must order {STANDARD_SUITS}')
+        if sorted(five_card_order) != sorted(STANDARD_FIVE_CARD_ORDER):
+            raise ValueError(f'five_card_order must order {STANDARD_FIVE_CARD_ORDER}')
+        self.name = name
+        self.rank_order = tuple(rank_order)
+        self.suit_order = tuple(suit_order)
+        self.five_card_order = tuple(five_card_order)
+        self.wrap = wrap
+        self.two_in_straight = two_in_straight
+        self._compile()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r})'
+
+    def _compile(self):
+        ranks = len(self.rank_order)
+        rank_index = {value: i for i, value in enumerate(self.rank_order)}
+        suit_index = {suit: i for i, suit in enumerate(self.suit_order)}
+        self.rank_of = tuple(rank_index[card.value] for card in CARDS)
+        self.suit_of = tuple(suit_index[card.suit] for card in CARDS)
+        self.order_of = tuple(rank * 4 + suit for rank, suit in zip(self.rank_of, self.suit_of))
+        self.rank_bits = tuple(1 << rank for rank in self.rank_of)
+
+        # card.id >> 2 of a card of each of the variant's ranks.
+        card_rank = [CARDS[self.rank_of.index(rank)].id >> 2 for rank in range(ranks)]
+        self.straight_tops = {}
+        windows = []
+        for low in range(ranks if self.wrap else ranks - 4):
+            window = [(low + i) % ranks for i in range(5)]
+            if not self.two_in_straight and rank_index['2'] in window:
+                continue
+            self.straight_tops[sum(1 << rank for rank in window)] = window[-1]
+            window = tuple(card_rank[rank] for rank in window)
+            windows.append((sum(1 << rank for rank in window), window))
+        self.straight_windows = tuple(windows)
+        self.straight_masks = frozenset(mask for mask, _ in windows)
+
+        self.five_card_group = {combotype: group
+                                for group, combotype in enumerate(self.five_card_order, 1)}
+        self._verifiers = {1: self._verify_single, 2: self._verify_pair,
+                           3: self._verify_three, 5: self._verify_five}
+        self._tie_breaks = {'Straight': self._straight_tie_break,
+                            'Flush': self._flush_tie_break,
+                            'Straight flush': self._flush_tie_break,
+                            'Full house': self._group_tie_break,
+                            'Four of a kind': self._group_tie_break}
+
+        settings = (self.rank_order, self.suit_order, self.five_card_order, self.wrap,
+                    self.two_in_straight)
+        self.standard = settings == (CARD_RANKS, STANDARD_SUITS, STANDARD_FIVE_CARD_ORDER,
+                                     False, True)
+        # Names the rules in cache keys that outlive the process.
+        self.key = 'standard' if self.standard \
+            else blake2b(repr(settings).encode(), digest_size=8).hexdigest()
+        # The standard game already ranks every CardPlay by its strength, and
+        # its five-card hands by the prebuilt combo_table.
+        if self.standard:
+            self.play_strength = play_strength
+            self.is_higher = _standard_higher
+        else:
+            self.play_strength = self._play_strength
+            self.is_higher = self._is_higher
+
+    # Validity and combination type.
+
+    def verify(self, cards):
+        """(valid, combotype) of cards under these rules."""
+        verifier = self._verifiers.get(len(cards))
+        if verifier is None:
+            return False, None
+        return verifier(cards)
+
+    def _verify_single(self, cards):
+        return True, 'Single'
+
+    def _verify_pair(self, cards):
+        rank_of = self.rank_of
+        if rank_of[cards[0].id] == rank_of[cards[1].id]:
+            return True, 'Pair'
+        return False, None
+
+    def _verify_three(self, cards):
+        rank_of = self.rank_of
+        if rank_of[cards[0].id] == rank_of[cards[1].id] == rank_of[cards[2].id]:
+            return True, 'Three of a kind'
+        return False, None
+
+    def _verify_five(self, cards):
+        ids = [card.id for card in cards]
+        flush = self.is_flush(ids)
+        if self.is_straight(ids):
+            return True, 'Straight flush' if flush else 'Straight'
+        if flush:
+            return True, 'Flush'
+        combotype = self.group_type(ids)
+        return combotype is not None, combotype
+
+    def rank_mask(self, ids):
+        rank_bits = self.rank_bits
+        mask = 0
+        for id_ in ids:
+            mask |= rank_bits[id_]
+        return mask
+
+    def is_straight(self, ids):
+        return len(ids) == 5 and self.rank_mask(ids) in self.straight_tops
+
+    def is_flush(self, ids):
+        suit_of = self.suit_of
+        return len(ids) == 5 and all(suit_of[id_] == suit_of[ids[0]] for id_ in ids)
+
+    def group_type(self, ids):
+        """'Full house' or 'Four of a kind' when five cards are one, else None."""
+        if len(ids) != 5:
+            return None
+        ranks = sorted([self.rank_of[id_] for id_ in ids])
+        return _GROUP_SHAPES.get((ranks[0] == ranks[1], ranks[1] == ranks[2],
+                                  ranks[2] == ranks[3], ranks[3] == ranks[4]))
+
+    # Strength within a category, as card.play_strength in the standard game.
+
+    def _play_strength(self, combotype, cards):
+        group = self.five_card_group.get(combotype)
+        if group is None:
+            order_of = self.order_of
+            return max(order_of[card.id] for card in cards)
+        return group << 6 | self._tie_breaks[combotype]([card.id for card in cards])
+
+    def _is_higher(self, card_play, other):
+        return card_play.category == other.category and \
+            self._play_strength(card_play.combotype, card_play.cards) \
+            > self._play_strength(other.combotype, other.cards)
+
+    def _straight_tie_break(self, ids):
+        # The card of the straight's top rank.
+        top_rank = self.straight_tops[self.rank_mask(ids)]
+        rank_of = self.rank_of
+        return next(self.order_of[id_] for id_ in ids if rank_of[id_] == top_rank)
+
+    def _flush_tie_break(self, ids):
+        mask = self.rank_mask(ids)
+        top_rank = self.straight_tops.get(mask)
+        if top_rank is None:
+            top_rank = mask.bit_length() - 1
+        return self.suit_of[ids[0]] * len(self.rank_order) + top_rank
+
+    def _group_tie_break(self, ids):
+        # The middle of five sorted ranks is the rank of the three or four.
+        return sorted([self.rank_of[id_] for id_ in ids])[2]
+
+
+def _standard_higher(card_play, other):
+    return card_play.category == other.category and card_play.strength > other.strength
+
+
+STANDARD = RuleSet(name='standard')
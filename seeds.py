@@ -0,0 +1,39 @@
+"""Reproducible, splittable random streams.
+
+One master seed stands for a whole run. Every game gets its own streams,
+derived from the master seed and the game index by hashing, so any
+worker can regenerate game N directly without playing games 0 .. N-1 or
+sharing random state with other workers.
+
+    rng = game_rng(master_seed, 1234)           # random.Random for game 1234
+    decks = batch.game_decks(master_seed, [1234])  # its NumPy deal
+"""
+
+import hashlib
+import random
+import secrets
+
+
+def new_master_seed():
+    """A fresh 64-bit master seed, to be reported so the run can be repeated."""
+    return secrets.randbits(64)
+
+
+def derive_seed(master_seed, *path):
+    """64-bit seed of the stream named by path (ints or strings) under master_seed."""
+    key = '/'.join(str(part) for part in (master_seed,) + path).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def game_rng(master_seed, game_index, stream='play'):
+    """random.Random for one stream of one game."""
+    return random.Random(derive_seed(master_seed, game_index, stream))
+
+
+def as_rng(rng=None):
+    """A random.Random from a seed; None gives the random module's shared generator."""
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
@@ -0,0 +1,314 @@
+"""Asyncio game server for many concurrent tables.
+
+Clients speak a line protocol over TCP. Cards are sent as card ids
+(see card.Card.id) joined by commas.
+
+Client to server:
+    JOIN <name>            take a seat at the next table with a free seat
+    PLAY <ids>             play these cards on your turn
+    PASS                   pass on your turn
+    QUIT                   leave
+
+Server to client:
+    SEAT <table> <seat>    you sit at this table and seat
+    DEAL <ids>             your hand, once the table is full
+    TURN <seat> <ids>|-    seat to move and the play to beat (- to lead)
+    MOVE <seat> <ids>|PASS a move made at the table
+    TIMEOUT <seat>         seat ran out of time and was moved for
+    OVER <seats>           finishing order; JOIN again for another game
+    ERR <message>          the last command was refused, or the table failed
+                           (then JOIN again)
+
+Each move must arrive within the table's move timeout, otherwise the
+server makes it: a pass when allowed, else the lowest legal play.
+Outgoing lines go through a bounded queue per client and incoming moves
+through a bounded queue per table, so a slow client cannot grow the
+server's memory. A client whose queue stays full for the send timeout has
+stopped reading; it is disconnected and moved for from then on, so it
+cannot stall its table.
+
+    python server.py --port 8642
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from card import CARDS, CardPlay
+from engine import GameEngine, IllegalMove, PASS
+from player import Player
+from validation import verify_combination
+
+logger = logging.getLogger(__name__)
+
+
+def format_cards(cards):
+    return ','.join(str(card.id) for card in cards)
+
+
+def parse_cards(text):
+    """Cards from comma-separated ids; ValueError if any is not a card id."""
+    ids = [int(id_) for id_ in text.split(',')]
+    if any(not 0 <= id_ < len(CARDS) for id_ in ids):
+        raise ValueError(f'Unknown card id in {text!r}')
+    return [CARDS[id_] for id_ in ids]
+
+
+def parse_play(text):
+    """CardPlay from comma-separated ids; ValueError if not a combination."""
+    cards = parse_cards(text)
+    valid, combotype = verify_combination(cards)
+    if not valid:
+        raise ValueError('Not a valid combination.')
+    return CardPlay(combotype, cards)
+
+
+def fallback_move(engine):
+    """Move made for a seat that timed out or left."""
+    if engine.can_pass():
+        return PASS
+    return min(engine.legal_moves(), key=lambda card_play: card_play.strength)
+
+
+class Connection:
+    """A client socket with a bounded queue of outgoing lines."""
+
+    def __init__(self, reader, writer, queue_size, send_timeout=5.0):
+        self.reader = reader
+        self.writer = writer
+        self.outbox = asyncio.Queue(queue_size)
+        self.send_timeout = send_timeout
+        self.closed = False
+        self.table = None
+        self.seat = None
+        self._sender = asyncio.create_task(self._send())
+
+    async def send(self, line):
+        if self.closed:
+            return
+        try:
+            await asyncio.wait_for(self.outbox.put(line), self.send_timeout)
+        except asyncio.TimeoutError:
+            self.abort()
+
+    def abort(self):
+        """Drop a client that stopped reading, with the lines queued for it."""
+        if self.closed:
+            return
+        self.closed = True
+        self.writer.transport.abort()
+        while not self.outbox.empty():
+            self.outbox.get_nowait()
+        self.outbox.put_nowait(None)
+
+    async def _send(self):
+        try:
+            while True:
+                line = await self.outbox.get()
+                if line is None:
+                    break
+                self.writer.write(line.encode() + b'\n')
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+            # Unblock anyone still waiting to queue a line.
+            while not self.outbox.empty():
+                self.outbox.get_nowait()
+
+    async def close(self):
+        await self.send(None)
+        await self._sender
+
+
+class Table:
+    """One game between the connections seated at it."""
+
+    def __init__(self, server, table_id):
+        self.server = server
+        self.id = table_id
+        self.seats = []
+        self.moves = asyncio.Queue(server.queue_size)
+        self.task = None
+
+    def is_full(self):
+        return len(self.seats) == self.server.seats_per_table
+
+    async def broadcast(self, line):
+        for connection in self.seats:
+            await connection.send(line)
+
+    async def run(self):
+        players = [Player(f'Seat {seat}') for seat in range(len(self.seats))]
+        seat_of = {player.name: seat for seat, player in enumerate(players)}
+        engine = GameEngine(players)
+        for connection, player in zip(self.seats, players):
+            await connection.send(f'DEAL {format_cards(sorted(player.hand))}')
+
+        while not engine.is_over():
+            seat = seat_of[engine.current_player.name]
+            to_beat = '-' if engine.has_control() else format_cards(engine.previous_move.cards)
+            await self.broadcast(f'TURN {seat} {to_beat}')
+            move = await self._next_move(engine, seat)
+            engine.apply(move)
+            self.server.moves += 1
+            await self.broadcast(f"MOVE {seat} {'PASS' if move is PASS else format_cards(move.cards)}")
+
+        order = ' '.join(str(seat_of[player.name]) for player in engine.finishing_order())
+        for connection in self.seats:
+            connection.table = connection.seat = None
+        await self.broadcast(f'OVER {order}')
+        self.server.games += 1
+        del self.server.tables[self.id]
+
+    async def _next_move(self, engine, seat):
+        """Wait for the seat's move until the timeout, refusing anything else."""
+        connection = self.seats[seat]
+        deadline = asyncio.get_running_loop().time() + self.server.move_timeout
+        while not connection.closed:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                sender, line = await asyncio.wait_for(self.moves.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if line is None:
+                # A client left; it is moved for from now on.
+                continue
+            if sender != seat:
+                await self.seats[sender].send('ERR Not your turn.')
+                continue
+            try:
+                move = PASS if line == 'PASS' else parse_play(line.partition(' ')[2])
+                engine.check(move)
+            except (ValueError, IllegalMove) as e:
+                await connection.send(f'ERR {e}')
+                continue
+            return move
+        await self.broadcast(f'TIMEOUT {seat}')
+        # Moves the seat sent too late must not count for its next turn.
+        self.discard_moves(seat)
+        return fallback_move(engine)
+
+    def discard_moves(self, seat):
+        """Drop the moves of seat still queued; notices that it left are kept."""
+        kept = []
+        while not self.moves.empty():
+            sender, line = self.moves.get_nowait()
+            if sender != seat or line is None:
+                kept.append((sender, line))
+        for entry in kept:
+            self.moves.put_nowait(entry)
+
+
+class Server:
+
+    def __init__(self, seats_per_table=4, move_timeout=10.0, queue_size=64, send_timeout=5.0):
+        self.seats_per_table = seats_per_table
+        self.move_timeout = move_timeout
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.tables = {}
+        self._filling = None
+        self._next_table_id = 0
+        self.games = 0
+        self.moves = 0
+        self._notices = set()
+
+    def join(self, connection):
+        if self._filling is None:
+            self._filling = Table(self, self._next_table_id)
+            self.tables[self._filling.id] = self._filling
+            self._next_table_id += 1
+        table = self._filling
+        connection.table, connection.seat = table, len(table.seats)
+        table.seats.append(connection)
+        if table.is_full():
+            self._filling = None
+            self.start(table)
+        return table
+
+    def start(self, table):
+        table.task = asyncio.create_task(table.run())
+        table.task.add_done_callback(lambda task: self._table_done(table, task))
+        return table.task
+
+    def _table_done(self, table, task):
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error('Table %s failed', table.id, exc_info=task.exception())
+        self.tables.pop(table.id, None)
+        # Unseat its clients, so they can JOIN another table.
+        for connection in table.seats:
+            connection.table = connection.seat = None
+        notice = asyncio.create_task(table.broadcast('ERR Table failed.'))
+        self._notices.add(notice)
+        notice.add_done_callback(self._notices.discard)
+
+    async def handle(self, reader, writer):
+        connection = Connection(reader, writer, self.queue_size, self.send_timeout)
+        try:
+            async for raw in reader:
+                command, _, args = raw.decode().strip().partition(' ')
+                command = command.upper()
+                if command == 'JOIN':
+                    if connection.table is not None:
+                        await connection.send('ERR Already seated.')
+                    else:
+                        table = self.join(connection)
+                        await connection.send(f'SEAT {table.id} {connection.seat}')
+                elif command in ('PLAY', 'PASS'):
+                    if connection.table is None:
+                        await connection.send('ERR Not seated.')
+                    else:
+                        await connection.table.moves.put((connection.seat, f'{command} {args}'.strip()))
+                elif command == 'QUIT':
+                    break
+                elif command:
+                    await connection.send(f'ERR Unknown command {command}.')
+        except ConnectionError:
+            pass
+        finally:
+            table = connection.table
+            await connection.close()
+            if table is not None:
+                if table is self._filling:
+                    # Leave a table that has not started: free the seat.
+                    table.seats.remove(connection)
+                    for seat, other in enumerate(table.seats):
+                        other.seat = seat
+                else:
+                    await table.moves.put((connection.seat, None))
+
+    async def serve(self, host='127.0.0.1', port=8642):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pusoy Dos game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8642)
+    parser.add_argument('--seats', type=int, default=4, help='players per table')
+    parser.add_argument('--move-timeout', type=float, default=10.0, help='seconds per move')
+    parser.add_argument('--send-timeout', type=float, default=5.0,
+                        help='seconds a client may leave its queue full before it is dropped')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig()
+    server = Server(args.seats, args.move_timeout, send_timeout=args.send_timeout)
+    start = time.process_time()
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    cpu = time.process_time() - start
+    print(f'{server.games} games, {server.moves} moves, {cpu:.2f} CPU seconds'
+          f' ({server.games / cpu if cpu else 0:.1f} games per core-second)')
+
+
+if __name__ == '__main__':
+    main()
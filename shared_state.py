@@ -0,0 +1,265 @@
+"""Game states in shared memory for process-pool evaluation.
+
+A SharedBatch lays out many game states as flat NumPy arrays in a single
+multiprocessing.shared_memory block, one row per state. Cards are card
+ids (see card.Card.id) and seats are indexes into the list of players
+the game was started with:
+
+    hands        (seats, hand size)  cards of each seat, sorted, -1 after the last
+    hand_sizes   (seats,)            cards left per seat
+    order        (seats,)            seats still playing in turn order, the seat
+                                     to move first, -1 after the last
+    finished     (seats,)            seats that emptied their hands, in order, -1 after
+    last_play    (5,)                cards of the play to beat, -1 after the last
+    combotype    ()                  gamelog.COMBOTYPE_CODES of that play, 0 for none
+    control      ()                  seat in control, -1 for none
+    pass_count   ()
+    first_turn   ()
+    output       (outputs,)          float64 results written by evaluators
+
+Workers attach to the block by name and evaluate rows in place, so only
+the block's name and a row range go through the pool; results are
+written straight into output. Evaluators read what they need straight
+from the arrays of a row; to_engine, which rebuilds a whole GameEngine,
+is only for evaluators that must play the game on.
+
+    with SharedBatch.create(len(engines), seats=4) as batch:
+        for row, (engine, players) in enumerate(zip(engines, seatings)):
+            batch.write(row, engine, players)
+        evaluate(batch, 'greedy_playout', executor)
+        places = batch.output[:, 0].copy()
+"""
+
+import random
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from card import CARDS, CardPlay
+from engine import GameEngine, OPENING_CARD
+from gamelog import COMBOTYPE_CODES, COMBOTYPES
+from moves import legal_moves
+from player import ActivePlayer, HandIndex, Player
+from policies import greedy_policy
+
+NO_CARD = -1
+NO_SEAT = -1
+
+# Name of a block and what is needed to lay it out again, sent to workers.
+BatchSpec = namedtuple('BatchSpec', ['name', 'count', 'seats', 'outputs'])
+
+
+def _fields(seats, outputs):
+    hand_size = -(-len(CARDS) // seats)
+    return [('hands', (seats, hand_size), np.int8),
+            ('hand_sizes', (seats,), np.int8),
+            ('order', (seats,), np.int8),
+            ('finished', (seats,), np.int8),
+            ('last_play', (5,), np.int8),
+            ('combotype', (), np.int8),
+            ('control', (), np.int8),
+            ('pass_count', (), np.int8),
+            ('first_turn', (), np.bool_),
+            ('output', (outputs,), np.float64)]
+
+
+def _layout(count, seats, outputs):
+    """(name, shape, dtype, offset) of every array, and the total size in bytes."""
+    layout = []
+    offset = 0
+    for name, shape, dtype in _fields(seats, outputs):
+        dtype = np.dtype(dtype)
+        # Keep every array aligned for its dtype.
+        offset = -(-offset // dtype.alignment) * dtype.alignment
+        layout.append((name, (count,) + shape, dtype, offset))
+        offset += count * int(np.prod(shape, dtype=int)) * dtype.itemsize
+    return layout, max(offset, 1)
+
+
+class SharedBatch:
+    """count game states of seats players in one shared memory block.
+
+    Use create in the process that owns the block and attach in workers.
+    """
+
+    def __init__(self, memory, count, seats, outputs, owner):
+        self._memory = memory
+        self.count = count
+        self.seats = seats
+        self.outputs = outputs
+        self.owner = owner
+        layout, _ = _layout(count, seats, outputs)
+        for name, shape, dtype, offset in layout:
+            setattr(self, name, np.ndarray(shape, dtype, memory.buf, offset))
+
+    @classmethod
+    def create(cls, count, seats=4, outputs=1):
+        _, size = _layout(count, seats, outputs)
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        batch = cls(memory, count, seats, outputs, owner=True)
+        batch.clear()
+        return batch
+
+    @classmethod
+    def attach(cls, spec):
+        # Pool workers share the owner's resource tracker, so attaching does
+        # not make them responsible for the block: only the owner unlinks it.
+        memory = shared_memory.SharedMemory(spec.name)
+        return cls(memory, spec.count, spec.seats, spec.outputs, owner=False)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.spec()})'
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def spec(self):
+        return BatchSpec(self._memory.name, self.count, self.seats, self.outputs)
+
+    def clear(self):
+        for array in (self.hands, self.order, self.finished, self.last_play):
+            array.fill(NO_CARD)
+        self.control.fill(NO_SEAT)
+        for array in (self.hand_sizes, self.combotype, self.pass_count, self.first_turn, self.output):
+            array.fill(0)
+
+    def close(self):
+        """Drop the arrays and detach; the owner also frees the block."""
+        for name, *_ in _fields(self.seats, self.outputs):
+            setattr(self, name, None)
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
+
+    def write(self, row, engine, players):
+        """Store engine's state in row; players are the engine's players in seat order."""
+        if len(players) != self.seats:
+            raise ValueError(f'Expected {self.seats} players, got {len(players)}')
+        seat_of = {player.name: seat for seat, player in enumerate(players)}
+        self.hands[row].fill(NO_CARD)
+        for seat, player in enumerate(players):
+            ids = [card.id for card in player.hand]
+            self.hands[row, seat, :len(ids)] = ids
+            self.hand_sizes[row, seat] = len(ids)
+
+        ring = [seat_of[player.name] for player in engine.players]
+        if not engine.is_over():
+            turn = ring.index(seat_of[engine.current_player.name])
+            ring = ring[turn:] + ring[:turn]
+        self.order[row].fill(NO_SEAT)
+        self.order[row, :len(ring)] = ring
+        finished = [seat_of[player.name] for player in engine.winners]
+        self.finished[row].fill(NO_SEAT)
+        self.finished[row, :len(finished)] = finished
+
+        self.last_play[row].fill(NO_CARD)
+        if engine.previous_move is None:
+            self.combotype[row] = 0
+        else:
+            ids = [card.id for card in engine.previous_move.cards]
+            self.last_play[row, :len(ids)] = ids
+            self.combotype[row] = COMBOTYPE_CODES[engine.previous_move.combotype]
+        control = engine.player_in_control
+        self.control[row] = NO_SEAT if control is None else seat_of[control.name]
+        self.pass_count[row] = engine.pass_count
+        self.first_turn[row] = engine.first_turn
+
+    def to_engine(self, row):
+        """A GameEngine in the state of row, played by Players 'Seat 1', 'Seat 2', ..."""
+        players = [Player(f'Seat {seat + 1}') for seat in range(self.seats)]
+        hands = [[CARDS[id_] for id_ in self.hands[row, seat, :self.hand_sizes[row, seat]].tolist()]
+                 for seat in range(self.seats)]
+        engine = GameEngine(players, hands=hands)
+        ring = [players[seat] for seat in self.order[row].tolist() if seat != NO_SEAT]
+        engine.players = ActivePlayer(*ring)
+        engine.winners = [players[seat] for seat in self.finished[row].tolist() if seat != NO_SEAT]
+        if ring:
+            engine.current_player = engine.players.assign_control(ring[0])
+        engine.previous_move = self.previous_move(row)
+        control = int(self.control[row])
+        engine.player_in_control = None if control == NO_SEAT else players[control]
+        engine.pass_count = int(self.pass_count[row])
+        engine.first_turn = bool(self.first_turn[row])
+        return engine
+
+    def hand_mask(self, row, seat):
+        """Card mask (see bitmask.py) of a seat's hand in row."""
+        mask = 0
+        for id_ in self.hands[row, seat, :self.hand_sizes[row, seat]].tolist():
+            mask |= 1 << id_
+        return mask
+
+    def previous_move(self, row):
+        """The play to beat in row as a CardPlay, or None."""
+        code = int(self.combotype[row])
+        if not code:
+            return None
+        return CardPlay(COMBOTYPES[code - 1],
+                        [CARDS[id_] for id_ in self.last_play[row].tolist() if id_ != NO_CARD])
+
+
+def legal_move_count(batch, row):
+    """Number of legal moves of the seat to move, as GameEngine.legal_moves counts them."""
+    seat = int(batch.order[row, 0])
+    if seat == NO_SEAT or batch.order[row, 1] == NO_SEAT:
+        # The game is over.
+        return 0
+    hand = HandIndex.from_mask(batch.hand_mask(row, seat))
+    previous_move = batch.previous_move(row)
+    if batch.first_turn[row]:
+        return sum(1 for _ in legal_moves(hand, required=OPENING_CARD))
+    if previous_move is None or batch.control[row] == seat:
+        return sum(1 for _ in legal_moves(hand))
+    # Plays that beat the previous move, and a pass.
+    return sum(1 for _ in legal_moves(hand, previous_move)) + 1
+
+
+def greedy_playout(engine):
+    """Place (1 first) the player to move finishes in when everyone plays greedily."""
+    mover = engine.current_player
+    rng = random.Random(0)
+    while not engine.is_over():
+        engine.apply(greedy_policy(engine, engine.legal_moves(), rng))
+    return engine.finishing_order().index(mover) + 1
+
+
+def greedy_playout_row(batch, row):
+    return greedy_playout(batch.to_engine(row))
+
+
+# Evaluators by name: evaluator(batch, row) -> float.
+EVALUATORS = {'legal_moves': legal_move_count,
+              'greedy_playout': greedy_playout_row}
+
+
+def evaluate_rows(spec, evaluator, start, stop):
+    """Evaluate rows start .. stop-1 of a batch in place; run in a worker."""
+    function = EVALUATORS[evaluator]
+    batch = SharedBatch.attach(spec)
+    try:
+        for row in range(start, stop):
+            batch.output[row, 0] = function(batch, row)
+    finally:
+        batch.close()
+    return stop - start
+
+
+def evaluate(batch, evaluator, executor, chunk_size=64):
+    """Evaluate every row of batch with EVALUATORS[evaluator] on executor.
+
+    Results go into column 0 of batch.output, which is returned.
+    """
+    spec = batch.spec()
+    futures = [executor.submit(evaluate_rows, spec, evaluator, start,
+                               min(start + chunk_size, batch.count))
+               for start in range(0, batch.count, chunk_size)]
+    for future in futures:
+        future.result()
+    return batch.output[:, 0]
@@ -0,0 +1,163 @@
+"""Batch self-play simulator.
+
+Plays complete games between bot policies (see policies.POLICIES) on a
+process pool and reports throughput, the winning seats and how each
+policy placed. Policies rotate through the seats from one game to the
+next so no policy keeps a seat advantage.
+
+Every game is dealt and played from its own random streams, derived from
+the run's master seed and the game index (see seeds.py), so a run is
+repeatable with --seed and any single game can be replayed on its own:
+
+    python simulate.py --games 100000 --policies greedy random random random
+    python simulate.py --seed 42 --replay 31337 --policies greedy random random random
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+from engine import GameEngine
+from player import Player
+from policies import POLICIES
+from seeds import game_rng, new_master_seed
+
+
+def seat_policies(policy_names, game_index, seats):
+    """Policy name of every seat in a game."""
+    return [policy_names[(seat + game_index) % len(policy_names)] for seat in range(seats)]
+
+
+def play_game(policy_names, rng, hands=None):
+    """Play one game to the end, dealt from a Deck shuffled with rng unless hands are given.
+
+    Returns the seats in finishing order and the number of moves made.
+    """
+    players = [Player(f'Seat {seat + 1}') for seat in range(len(policy_names))]
+    seat_of = {player.name: seat for seat, player in enumerate(players)}
+    policies = [POLICIES[name] for name in policy_names]
+    engine = GameEngine(players, hands=hands, rng=rng)
+    while not engine.is_over():
+        seat = seat_of[engine.current_player.name]
+        engine.apply(policies[seat](engine, engine.legal_moves(), rng))
+    return [seat_of[player.name] for player in engine.finishing_order()], engine.move_count
+
+
+def deal_games(seed, game_indices, seats):
+    """Hands of each game, or None for each game when the deck does not split
+    evenly and play_game deals from a Deck instead."""
+    if batch.DECK_SIZE % seats:
+        return [None] * len(game_indices)
+    deals = batch.deal(batch.game_decks(seed, game_indices), seats)
+    return [[batch.to_cards(hand) for hand in deal] for deal in deals]
+
+
+def replay_game(policy_names, seats, seed, game_index):
+    """Play game game_index of the run with this master seed again.
+
+    Returns the policy of every seat, the seats in finishing order and the
+    number of moves made, exactly as in the original run.
+    """
+    names = seat_policies(policy_names, game_index, seats)
+    hands, = deal_games(seed, [game_index], seats)
+    return (names,) + play_game(names, game_rng(seed, game_index), hands)
+
+
+def run_batch(policy_names, seats, seed, first_game, games):
+    """Play games first_game .. first_game+games-1 of the run and tally the results."""
+    winning_seats = Counter()
+    per_policy = {name: Counter() for name in policy_names}
+    moves = 0
+    game_indices = range(first_game, first_game + games)
+    for game_index, hands in zip(game_indices, deal_games(seed, game_indices, seats)):
+        names = seat_policies(policy_names, game_index, seats)
+        order, move_count = play_game(names, game_rng(seed, game_index), hands)
+        moves += move_count
+        winning_seats[order[0]] += 1
+        for place, seat in enumerate(order, 1):
+            stats = per_policy[names[seat]]
+            stats['seats'] += 1
+            stats['place_total'] += place
+            stats['wins'] += place == 1
+            stats['losses'] += place == seats
+    return games, moves, winning_seats, per_policy
+
+
+def simulate(policy_names, games, seats=4, workers=None, chunk_size=500, seed=None):
+    """Play games across a process pool and return the combined results.
+
+    Without a master seed a fresh one is drawn; it is part of the results.
+    """
+    if seed is None:
+        seed = new_master_seed()
+    start = time.perf_counter()
+    total_games = total_moves = 0
+    winning_seats = Counter()
+    per_policy = {name: Counter() for name in policy_names}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_batch, policy_names, seats, seed, first,
+                                   min(chunk_size, games - first))
+                   for first in range(0, games, chunk_size)]
+        for future in futures:
+            batch_games, batch_moves, batch_seats, batch_policy = future.result()
+            total_games += batch_games
+            total_moves += batch_moves
+            winning_seats.update(batch_seats)
+            for name, stats in batch_policy.items():
+                per_policy[name].update(stats)
+    elapsed = time.perf_counter() - start
+    return {'seed': seed,
+            'games': total_games,
+            'moves': total_moves,
+            'seconds': elapsed,
+            'games_per_second': total_games / elapsed,
+            'moves_per_second': total_moves / elapsed,
+            'winning_seats': dict(sorted(winning_seats.items())),
+            'policies': {name: dict(stats) for name, stats in per_policy.items()}}
+
+
+def report(results):
+    print(f"Master seed {results['seed']}")
+    print(f"{results['games']} games, {results['moves']} moves in {results['seconds']:.2f}s")
+    print(f"{results['games_per_second']:.1f} games/s, {results['moves_per_second']:.1f} moves/s")
+    print('Winning seats:')
+    for seat, wins in results['winning_seats'].items():
+        print(f"  Seat {seat + 1}: {wins} ({wins / results['games']:.1%})")
+    print('Policies:')
+    for name, stats in results['policies'].items():
+        seats = stats.get('seats', 0)
+        if not seats:
+            continue
+        print(f"  {name}: won {stats['wins'] / seats:.1%}, lost {stats['losses'] / seats:.1%}, "
+              f"average place {stats['place_total'] / seats:.2f} over {seats} seats")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policies', nargs='+', default=['greedy', 'random'],
+                        choices=sorted(POLICIES))
+    parser.add_argument('--seats', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, help='master seed (default: a fresh one)')
+    parser.add_argument('--replay', type=int, metavar='GAME',
+                        help='play only this game of the run with --seed and show its result')
+    args = parser.parse_args(argv)
+    if args.replay is not None:
+        if args.seed is None:
+            parser.error('--replay needs the --seed of the run')
+        names, order, moves = replay_game(args.policies, args.seats, args.seed, args.replay)
+        print(f'Game {args.replay}: {moves} moves')
+        for place, seat in enumerate(order, 1):
+            print(f'  {place}. Seat {seat + 1} ({names[seat]})')
+        return
+    report(simulate(args.policies, args.games, args.seats, args.workers, args.chunk_size,
+                    args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Exact endgame solver.
+
+With all hands known and few cards left, the game can be searched to the
+end. The solver plays paranoid alpha-beta for the player to move (the
+root): every other player is assumed to play against the root. A
+position is worth +1 if the root empties its hand before any other
+remaining player, otherwise -1.
+
+Positions are searched on a compact state: one card mask per seat, the
+seat to move, the play to beat, the seat in control and the pass count.
+Results go into a bounded transposition table with LRU eviction, which
+is kept between calls so consecutive decisions reuse earlier work, as
+long as they are under the same rules (see GameEngine.rules).
+"""
+
+from collections import OrderedDict
+
+from bitmask import from_cards
+from card import CardPlay
+from engine import OPENING_CARD, PASS
+from moves import legal_moves
+from player import HandIndex
+
+WIN = 1
+LOSS = -1
+
+_EXACT, _LOWER, _UPPER = range(3)
+
+
+class EndgameSolver:
+    """Solve endgames with a transposition table of at most max_entries."""
+
+    def __init__(self, max_entries=1000000):
+        self.max_entries = max_entries
+        self.table = OrderedDict()
+        self.rules = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(entries={len(self.table)}, hits={self.hits}, '
+                f'misses={self.misses}, evictions={self.evictions})')
+
+    def clear(self):
+        self.table.clear()
+
+    def solve(self, engine):
+        """Return (value, move) of the best move for the engine's current player."""
+        if engine.rules is not self.rules:
+            # Positions are only worth the same under the same rules.
+            self.clear()
+            self.rules = engine.rules
+        seats = list(engine.players)
+        masks = tuple(player.mask for player in seats)
+        turn = seats.index(engine.current_player)
+        control = seats.index(engine.player_in_control) \
+            if engine.player_in_control in engine.players else -1
+        previous_move = None if engine.has_control() else engine.previous_move
+        if previous_move is not None:
+            # With the strength it has under the rules, like the plays searched.
+            previous_move = CardPlay(previous_move.combotype, previous_move.cards, self.rules)
+        required = OPENING_CARD if engine.first_turn else None
+
+        best_value, best_move = LOSS - 1, None
+        alpha, beta = LOSS, WIN
+        for move in self._moves(masks, turn, previous_move, control, required):
+            value = self._value(masks, turn, previous_move, control, engine.pass_count,
+                                turn, move, alpha, beta)
+            if value > best_value:
+                best_value, best_move = value, move
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+        return best_value, best_move
+
+    def _moves(self, masks, turn, previous_move, control, required=None):
+        """Legal moves at a position, plays that shed the most cards first."""
+        has_control = previous_move is None or control == turn
+        plays = list(legal_moves(HandIndex.from_mask(masks[turn]),
+                                 None if has_control else previous_move, required, self.rules))
+        plays.sort(key=lambda card_play: -len(card_play.cards))
+        if not has_control and required is None:
+            plays.append(PASS)
+        return plays
+
+    def _value(self, masks, turn, previous_move, control, passes, root, move, alpha, beta):
+        """Value for the root of making move at a position."""
+        seats = len(masks)
+        if move is PASS:
+            passes += 1
+        else:
+            hand = masks[turn] & ~from_cards(move.cards)
+            if not hand:
+                return WIN if turn == root else LOSS
+            masks = masks[:turn] + (hand,) + masks[turn+1:]
+            previous_move, control, passes = move, turn, 0
+        turn = (turn + 1) % seats
+        # Everyone else passed: the player to move leads anew.
+        if passes >= (seats - 1 if control >= 0 else seats):
+            previous_move, control, passes = None, turn, 0
+        return self._search(masks, turn, previous_move, control, passes, root, alpha, beta)
+
+    def _search(self, masks, turn, previous_move, control, passes, root, alpha, beta):
+        previous_key = None if previous_move is None \
+            else (previous_move.category, previous_move.strength)
+        key = (masks, turn, previous_key, control, passes, root)
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            flag, value = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+        else:
+            self.misses += 1
+
+        original_alpha, original_beta = alpha, beta
+        maximizing = turn == root
+        best = LOSS - 1 if maximizing else WIN + 1
+        for move in self._moves(masks, turn, previous_move, control):
+            value = self._value(masks, turn, previous_move, control, passes, root,
+                                move, alpha, beta)
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = _UPPER
+        elif best >= original_beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._store(key, (flag, best))
+        return best
+
+    def _store(self, key, entry):
+        self.table[key] = entry
+        self.table.move_to_end(key)
+        if len(self.table) > self.max_entries:
+            self.table.popitem(last=False)
+            self.evictions += 1
+
+
+def solve(engine, max_entries=1000000):
+    """Best (value, move) for the current player, with a fresh solver."""
+    return EndgameSolver(max_entries).solve(engine)
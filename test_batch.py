@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+
+import batch
+from card import Card
+from engine import GameEngine
+from player import Player
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_shuffled_decks(self):
+        decks = batch.shuffled_decks(100, rng=1)
+        self.assertEqual(decks.shape, (100, 52))
+        self.assertTrue((np.sort(decks, axis=1) == np.arange(52)).all())
+        self.assertTrue((decks == batch.shuffled_decks(100, rng=1)).all())
+
+    def test_game_decks(self):
+        decks = batch.game_decks(7, range(10, 20))
+        self.assertTrue((np.sort(decks, axis=1) == np.arange(52)).all())
+        # A game's deck depends only on the master seed and its index.
+        self.assertTrue((batch.game_decks(7, [15])[0] == decks[5]).all())
+        self.assertFalse((batch.game_decks(8, [15])[0] == decks[5]).all())
+
+    def test_deal(self):
+        decks = batch.shuffled_decks(10, rng=2)
+        hands = batch.deal(decks, sort=False)
+        self.assertEqual(hands.shape, (10, 4, 13))
+        # Cards go round the table one at a time.
+        self.assertEqual(hands[3, 1, 2], decks[3, 2 * 4 + 1])
+        self.assertRaises(ValueError, batch.deal, decks, 3)
+
+    def test_opening_seats(self):
+        hands = batch.deal(batch.shuffled_decks(50, rng=3))
+        for hand, seat in zip(hands, batch.opening_seats(hands)):
+            self.assertIn(Card('Clubs', '3'), batch.to_cards(hand[seat]))
+
+    def test_engine_from_hands(self):
+        hands = batch.deal(batch.shuffled_decks(1, rng=4))[0]
+        players = [Player(name) for name in ('John', 'Jane', 'Jess', 'June')]
+        engine = GameEngine(players, hands=[batch.to_cards(hand) for hand in hands])
+        self.assertIs(engine.current_player, players[batch.opening_seats(hands[None])[0]])
+        self.assertEqual(players[2].card_count(), 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from itertools import combinations
+from random import Random
+
+import bitmask
+import validation
+from card import Card, CARDS
+
+
+class TestBitmask(unittest.TestCase):
+
+    def test_round_trip(self):
+        cards = [Card('Clubs', '3'), Card('Hearts', 'Queen'), Card('Diamonds', '2')]
+        mask = bitmask.from_cards(cards)
+        self.assertEqual(bitmask.popcount(mask), 3)
+        self.assertEqual(bitmask.to_cards(mask), cards)
+        self.assertEqual(bitmask.to_cards(bitmask.FULL_DECK), list(CARDS))
+
+    def test_rules_match_validation(self):
+        rng = Random(2018)
+        samples = [rng.sample(CARDS, 5) for _ in range(3000)]
+        # Make sure every five-card combination is represented.
+        samples += [[Card(suit, value) for value in ('10', 'Jack', 'Queen', 'King', 'Ace')]
+                    for suit in ('Clubs', 'Hearts')]
+        samples += [[Card('Clubs', '4'), Card('Hearts', '4'), Card('Spades', '4'),
+                     Card('Diamonds', '4'), Card('Clubs', '9')],
+                    [Card('Clubs', '4'), Card('Hearts', '4'), Card('Spades', '4'),
+                     Card('Diamonds', '9'), Card('Clubs', '9')]]
+        samples += [list(cards) for cards in combinations(CARDS[:12], 2)]
+        samples += [list(cards) for cards in combinations(CARDS[:12], 3)]
+        for cards in samples:
+            mask = bitmask.from_cards(cards)
+            self.assertEqual(bitmask.verify_combination(mask),
+                             validation.verify_combination(cards), cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
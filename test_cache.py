@@ -0,0 +1,38 @@
+import unittest
+
+from cache import CombinationCache
+from card import Card
+from rules import RuleSet
+
+
+class TestCombinationCache(unittest.TestCase):
+
+    def test_verify_combination(self):
+        cache = CombinationCache(maxsize=2)
+        pair = [Card('Hearts', 'Queen'), Card('Clubs', 'Queen')]
+        self.assertEqual(cache.verify_combination(pair), (True, 'Pair'))
+        self.assertEqual(cache.verify_combination(pair[::-1]), (True, 'Pair'))
+        self.assertEqual(cache.verify_combination([Card('Clubs', '3'), Card('Clubs', '4')]),
+                         (False, None))
+        self.assertEqual(cache.info()[:3], (1, 2, 0))
+        cache.verify_combination([Card('Clubs', '5')])
+        self.assertEqual(cache.info().evictions, 1)
+        self.assertEqual(len(cache), 2)
+        # Repeated cards bypass the cache.
+        self.assertEqual(cache.verify_combination([Card('Clubs', '5')] * 2), (True, 'Pair'))
+        self.assertEqual(cache.info().misses, 3)
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 2, 0))
+
+    def test_rules(self):
+        cache = CombinationCache()
+        cards = [Card('Clubs', 'Jack'), Card('Spades', 'Queen'), Card('Hearts', 'King'),
+                 Card('Diamonds', 'Ace'), Card('Clubs', '2')]
+        self.assertEqual(cache.verify_combination(cards), (True, 'Straight'))
+        self.assertEqual(cache.verify_combination(cards, RuleSet(two_in_straight=False)),
+                         (False, None))
+        self.assertEqual(cache.info()[:2], (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
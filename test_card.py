@@ -0,0 +1,46 @@
+import pickle
+import unittest
+from functools import partial
+
+from card import Card, Deck, CARDS, card_func_key
+
+
+class TestCard(unittest.TestCase):
+
+    def test_interned(self):
+        self.assertIs(Card('Clubs', '3'), Card('Clubs', '3'))
+        self.assertIs(Card('Hearts', 'Ace'), CARDS[Card('Hearts', 'Ace').id])
+        self.assertIs(pickle.loads(pickle.dumps(Card('Spades', '10'))), Card('Spades', '10'))
+        self.assertRaises(ValueError, Card, 'Clubs', '1')
+
+    def test_card_id(self):
+        self.assertEqual(Card('Clubs', '3').id, 0)
+        self.assertEqual(Card('Diamonds', '3').id, 3)
+        self.assertEqual(Card('Diamonds', '2').id, 51)
+        self.assertEqual(sorted(card.id for card in CARDS), list(range(52)))
+
+    def test_ordering(self):
+        self.assertTrue(Card('Diamonds', '3') > Card('Hearts', '3'))
+        self.assertTrue(Card('Clubs', '2') > Card('Diamonds', 'Ace'))
+        self.assertEqual(sorted(CARDS), sorted(CARDS, key=partial(card_func_key, valueby='rank')))
+        self.assertEqual(len({Card('Clubs', '3'), Card('Clubs', '3')}), 1)
+
+    def test_deck_build(self):
+        deck = Deck()
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(len(set(deck._cards)), 52)
+        self.assertIs(deck.draw_card(), Card('Diamonds', 'King'))
+
+    def test_deck_shuffle_seed(self):
+        decks = []
+        for _ in range(2):
+            deck = Deck()
+            deck.shuffle(2018)
+            decks.append(deck._cards)
+        self.assertEqual(decks[0], decks[1])
+        self.assertEqual(sorted(decks[0]), sorted(CARDS))
+        self.assertNotEqual(decks[0], Deck()._cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
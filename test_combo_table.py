@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from itertools import combinations
+from random import Random
+
+import bitmask
+import combo_table
+import validation
+from card import Card, CARDS, five_card_strength
+
+# The partial tables of the tests hold the sets of the 24 lowest cards, 3 to 8.
+LOW_CARDS = 24
+
+
+class TestComboTable(unittest.TestCase):
+
+    def test_combination_index(self):
+        # Colex order: sets whose highest card is lower come first.
+        self.assertEqual(combo_table.combination_index([0, 1, 2, 3, 4]), 0)
+        self.assertEqual(combo_table.combination_index([4, 3, 2, 1, 0]), 0)
+        self.assertEqual(combo_table.combination_index([0, 1, 2, 3, 5]), 1)
+        self.assertEqual(combo_table.combination_index([47, 48, 49, 50, 51]),
+                         combo_table.TABLE_SIZE - 1)
+        indexes = {combo_table.combination_index(ids) for ids in combinations(range(12), 5)}
+        self.assertEqual(indexes, set(range(792)))
+
+    def test_classify(self):
+        def strength(*cards):
+            return combo_table.classify(sum(1 << Card(*card).id for card in cards))
+
+        straight = strength(('Clubs', '10'), ('Hearts', 'Jack'), ('Clubs', 'Queen'),
+                            ('Clubs', 'King'), ('Clubs', 'Ace'))
+        flush = strength(('Clubs', '3'), ('Clubs', '5'), ('Clubs', '9'),
+                         ('Clubs', 'King'), ('Clubs', 'Ace'))
+        quad = strength(('Clubs', '3'), ('Spades', '3'), ('Hearts', '3'),
+                        ('Diamonds', '3'), ('Clubs', 'Ace'))
+        self.assertTrue(0 < straight < flush < quad)
+        self.assertEqual(combo_table.COMBOTYPES[quad >> 6], 'Four of a kind')
+        self.assertEqual(strength(('Clubs', '3'), ('Spades', '3'), ('Hearts', '4'),
+                                  ('Diamonds', '5'), ('Clubs', 'Ace')), 0)
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.bin')
+            with open(path, 'wb') as f:
+                f.write(b'not a table')
+            self.assertRaises(ValueError, combo_table.FiveCardTable, path)
+
+    def test_table_lookups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = combo_table.write(combo_table.classify_all(LOW_CARDS),
+                                     os.path.join(tmp, 'table.bin'))
+            table = combo_table.FiveCardTable(path)
+            try:
+                self.assertEqual(len(table), combo_table.TABLE_SIZE)
+                rng = Random(3)
+                for _ in range(5000):
+                    ids = rng.sample(range(LOW_CARDS), 5)
+                    valid, combotype = bitmask.verify_combination(sum(1 << id_ for id_ in ids))
+                    self.assertEqual(table.verify(ids), (valid, combotype), ids)
+                    if valid:
+                        self.assertEqual(table.strength(ids), five_card_strength(combotype, ids))
+            finally:
+                table.close()
+
+    def test_verify_combination_uses_table(self):
+        saved = combo_table._table, combo_table._searched
+        with tempfile.TemporaryDirectory() as tmp:
+            path = combo_table.write(combo_table.classify_all(LOW_CARDS),
+                                     os.path.join(tmp, 'table.bin'))
+            table = combo_table.load(path)
+            try:
+                rng = Random(4)
+                for _ in range(2000):
+                    cards = rng.sample(CARDS[:LOW_CARDS], 5)
+                    self.assertEqual(validation.verify_combination(cards),
+                                     bitmask.verify_combination(bitmask.from_cards(cards)), cards)
+            finally:
+                table.close()
+                combo_table._table, combo_table._searched = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
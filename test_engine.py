@@ -0,0 +1,60 @@
+import unittest
+from random import Random
+
+from card import CardPlay, CARDS
+from engine import GameEngine, IllegalMove, OPENING_CARD, PASS
+from player import Player
+
+
+def new_game():
+    return GameEngine([Player('John'), Player('Jane'), Player('Jess'), Player('June')])
+
+
+class TestGameEngine(unittest.TestCase):
+
+    def test_opening(self):
+        engine = new_game()
+        self.assertIn(OPENING_CARD, engine.current_player.hand)
+        self.assertTrue(engine.has_control())
+        self.assertFalse(engine.can_pass())
+        moves = engine.legal_moves()
+        self.assertTrue(moves)
+        self.assertTrue(all(OPENING_CARD in card_play.cards for card_play in moves))
+        self.assertRaises(IllegalMove, engine.apply, PASS)
+
+    def test_illegal_moves(self):
+        engine = new_game()
+        hand = engine.current_player.hand
+        other = next(card for card in hand if card != OPENING_CARD)
+        self.assertRaises(IllegalMove, engine.apply, CardPlay('Single', [other]))
+        missing = next(card for card in CARDS if card not in hand)
+        self.assertRaises(IllegalMove, engine.apply, CardPlay('Single', [missing]))
+        self.assertRaises(IllegalMove, engine.apply, CardPlay('Pair', [OPENING_CARD]))
+        engine.apply(CardPlay('Single', [OPENING_CARD]))
+        self.assertEqual(engine.previous_move.cards, [OPENING_CARD])
+        self.assertTrue(engine.can_pass())
+
+    def test_control_returns_after_passes(self):
+        engine = new_game()
+        leader = engine.current_player
+        engine.apply(CardPlay('Single', [OPENING_CARD]))
+        for _ in range(3):
+            engine.apply(PASS)
+        self.assertEqual(engine.current_player, leader)
+        self.assertTrue(engine.has_control())
+        self.assertEqual(engine.pass_count, 0)
+
+    def test_random_games(self):
+        rng = Random(2018)
+        for _ in range(20):
+            engine = new_game()
+            while not engine.is_over():
+                engine.apply(rng.choice(engine.legal_moves()))
+            order = engine.finishing_order()
+            self.assertEqual(len(order), 4)
+            self.assertEqual(sum(player.card_count() for player in order[:3]), 0)
+            self.assertTrue(order[-1].hand)
+
+
+if __name__ == '__main__':
+    unittest.main()
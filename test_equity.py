@@ -0,0 +1,53 @@
+import unittest
+
+import batch
+import equity
+from card import Card, CARDS
+
+
+def reference_strength(hand):
+    ranks = [card.id >> 2 for card in hand]
+    counts = [ranks.count(rank) for rank in range(13)]
+    suits = [sum(card.id & 3 == suit for card in hand) for suit in range(4)]
+    straight = any(all(counts[rank] for rank in range(low, low + 5)) for low in range(9))
+    features = {'twos': counts[12], 'aces': counts[11], 'kings': counts[10],
+                'pairs': counts.count(2), 'triples': counts.count(3), 'quads': counts.count(4),
+                'straight': straight, 'flush': max(suits) >= 5,
+                'low_singles': counts[:8].count(1), 'opening': Card('Clubs', '3') in hand}
+    return sum(equity.WEIGHTS[name] * value for name, value in features.items())
+
+
+class TestEquity(unittest.TestCase):
+
+    def test_hand_strength(self):
+        hands = batch.deal(batch.shuffled_decks(50, rng=1))
+        strengths = equity.hand_strength(hands)
+        self.assertEqual(strengths.shape, (50, 4))
+        for deal, deal_strengths in zip(hands, strengths):
+            for hand, strength in zip(deal, deal_strengths):
+                self.assertAlmostEqual(strength, reference_strength(batch.to_cards(hand)))
+
+    def test_estimate(self):
+        strong = [CARDS[0]] + [card for card in CARDS if card.id >> 2 >= 10]
+        weak = [CARDS[id_] for id_ in range(1, 52, 4)]
+        strong_equity = equity.estimate(strong, precision=0.02, rng=1)
+        weak_equity = equity.estimate(weak, precision=0.02, rng=1)
+        self.assertLessEqual(strong_equity.first_error, 0.02)
+        self.assertLessEqual(strong_equity.last_error, 0.02)
+        self.assertGreater(strong_equity.first, 0.5)
+        self.assertGreater(weak_equity.last, strong_equity.last)
+        self.assertLess(weak_equity.first, strong_equity.first)
+        self.assertEqual(equity.estimate(strong, precision=0.02, rng=1), strong_equity)
+        self.assertEqual(equity.estimate(strong, precision=0, max_samples=100).samples, 100)
+        self.assertRaises(ValueError, equity.estimate, strong[:12])
+
+    def test_estimate_many(self):
+        hands = batch.deal(batch.shuffled_decks(20, rng=2))[:, 0]
+        result = equity.estimate_many(hands, samples=500, chunk_size=8, rng=3)
+        self.assertEqual(result.first.shape, (20,))
+        self.assertTrue(((result.first >= 0) & (result.first + result.last <= 1)).all())
+        self.assertTrue((result.first_error < 0.05).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+import main
+from export import RecordWriter, export_games, load
+from testing import greedy_script
+
+
+class TestExport(unittest.TestCase):
+
+    def test_export_games(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with RecordWriter(directory, chunk_size=100) as writer:
+                export_games(writer, ['greedy', 'random'], 5, seed=24)
+            chunks = list(load(directory))
+            self.assertEqual(writer.chunks, len(chunks))
+            self.assertTrue(all(len(chunk['game']) == 100 for chunk in chunks[:-1]))
+            records = {name: np.concatenate([chunk[name] for chunk in chunks])
+                       for name in chunks[0]}
+        self.assertEqual(len(records['game']), writer.records)
+        self.assertEqual(sorted(set(records['game'].tolist())), list(range(5)))
+        self.assertFalse((records['hand'] & records['unseen']).any())
+        self.assertTrue(((records['play'] & ~records['hand']) == 0).all())
+        unseen = [int(mask).bit_count() for mask in records['unseen']]
+        self.assertEqual(unseen, records['opponents'].sum(axis=1).tolist())
+        passes = records['play'] == 0
+        self.assertTrue((records['combotype'][passes] == 0).all())
+        self.assertTrue((records['prev_category'][passes] >= 0).all())
+        self.assertTrue(set(records['outcome'].tolist()) <= {1, 2, 3, 4})
+        # The first decision of every game leads with the 3 of Clubs.
+        first = np.unique(records['game'], return_index=True)[1]
+        self.assertTrue((records['play'][first] & 1 == 1).all())
+
+    def test_main_export(self):
+        lines, loser = greedy_script(7)
+        with tempfile.TemporaryDirectory() as directory:
+            with redirect_stdout(io.StringIO()), \
+                    mock.patch('sys.stdin', io.StringIO('\n'.join(lines))):
+                main.main(['--seed', '7', '--quiet', '--export', directory])
+            records, = load(directory)
+        self.assertEqual(len(records['game']), lines.count('Done') + lines.count('Pass'))
+        self.assertEqual(records['outcome'][-1], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
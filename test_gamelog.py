@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+
+import gamelog
+from engine import GameEngine
+from player import Player
+
+
+def play_logged_game(writer, rng, seed):
+    players = [Player(f'Seat {seat + 1}') for seat in range(4)]
+    engine = GameEngine(players)
+    writer.start_game([list(player.hand) for player in players], seed)
+    while not engine.is_over():
+        move = rng.choice(engine.legal_moves())
+        writer.move(players.index(engine.current_player), move)
+        engine.apply(move)
+    writer.end_game()
+    return engine
+
+
+class TestGameLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'games.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        rng = random.Random(14)
+        with gamelog.GameLogWriter(self.path) as writer:
+            engines = [play_logged_game(writer, rng, seed) for seed in range(3)]
+        # Appending keeps the earlier games.
+        with gamelog.GameLogWriter(self.path) as writer:
+            engines.append(play_logged_game(writer, rng, 3))
+
+        with gamelog.GameLogReader(self.path) as reader:
+            games = list(reader)
+            self.assertEqual([game.seed for game in games], [0, 1, 2, 3])
+            for game, engine in zip(games, engines):
+                self.assertEqual(len(game), engine.move_count)
+                replayed = gamelog.replay(game)
+                self.assertTrue(replayed.is_over())
+                self.assertEqual([player.name for player in replayed.finishing_order()],
+                                 [player.name for player in engine.finishing_order()])
+            midway = gamelog.replay(games[0], 10)
+            self.assertEqual(midway.move_count, 10)
+
+    def test_truncated_game(self):
+        rng = random.Random(15)
+        with gamelog.GameLogWriter(self.path) as writer:
+            play_logged_game(writer, rng, 0)
+            play_logged_game(writer, rng, 1)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        with gamelog.GameLogReader(self.path) as reader:
+            self.assertEqual([game.seed for game in reader], [0])
+
+    def test_append_after_partial_game(self):
+        rng = random.Random(16)
+        with gamelog.GameLogWriter(self.path) as writer:
+            play_logged_game(writer, rng, 0)
+            # A crash midway through the second game.
+            players = [Player(f'Seat {seat + 1}') for seat in range(4)]
+            engine = GameEngine(players)
+            writer.start_game([list(player.hand) for player in players], 1)
+            for _ in range(16):
+                move = rng.choice(engine.legal_moves())
+                writer.move(players.index(engine.current_player), move)
+                engine.apply(move)
+        with gamelog.GameLogWriter(self.path) as writer:
+            engines = [play_logged_game(writer, rng, seed) for seed in (2, 3)]
+
+        with gamelog.GameLogReader(self.path) as reader:
+            games = list(reader)
+            self.assertEqual([game.seed for game in games], [0, 2, 3])
+            for game, engine in zip(games[1:], engines):
+                self.assertEqual(len(game), engine.move_count)
+                self.assertTrue(gamelog.replay(game).is_over())
+
+    def test_bad_game_tag(self):
+        rng = random.Random(17)
+        with gamelog.GameLogWriter(self.path) as writer:
+            play_logged_game(writer, rng, 0)
+        with open(self.path, 'ab') as f:
+            f.write(b'X' * 32)
+        with gamelog.GameLogReader(self.path) as reader:
+            self.assertEqual([game.seed for game in reader], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import main
+from card import Card, CARDS
+from testing import greedy_script
+
+
+class TestScriptMode(unittest.TestCase):
+
+    def run_main(self, argv, stdin=''):
+        output = io.StringIO()
+        with redirect_stdout(output), mock.patch('sys.stdin', io.StringIO(stdin)):
+            main.main(argv)
+        return output.getvalue()
+
+    def test_parse_card(self):
+        self.assertIs(main.parse_card('hearts jack'), Card('Hearts', 'Jack'))
+        self.assertIs(main.parse_card(' Diamonds   10 '), Card('Diamonds', '10'))
+        self.assertIsNone(main.parse_card('Hearts 1'))
+        self.assertEqual(len({main.parse_card(f'{card.suit} {card.value}') for card in CARDS}), 52)
+
+    def test_replay_script(self):
+        lines, loser = greedy_script(23)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.txt')
+            record = os.path.join(directory, 'record.txt')
+            with open(path, 'w') as f:
+                f.write('# greedy game\n' + '\n'.join(lines) + '\n')
+            output = self.run_main(['--script', path, '--seed', '23', '--quiet', '--record', record])
+            self.assertEqual(output, f'Game over. Loser: {loser}\n')
+            with open(record) as f:
+                self.assertEqual(f.read().splitlines(), lines)
+        # Piped stdin is read as a script too.
+        output = self.run_main(['--seed', '23'], stdin='\n'.join(lines))
+        self.assertTrue(output.endswith(f'Game over. Loser: {loser}\n'))
+
+    def test_script_errors(self):
+        lines, _ = greedy_script(5)
+        with self.assertRaises(SystemExit) as raised:
+            self.run_main(['--seed', '5', '--quiet'], stdin='Hearts 1\n')
+        self.assertEqual(str(raised.exception), "<stdin>:1: Wrong input: Hearts 1")
+        with self.assertRaises(SystemExit) as raised:
+            self.run_main(['--seed', '5', '--quiet'], stdin='\n'.join(lines[:10]))
+        self.assertIn('ended before the game was over', str(raised.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from engine import GameEngine
+from mcts import MCTSPlayer, determinize, move_key, search
+from player import Player
+
+
+def new_game(first):
+    return GameEngine([first, Player('Jane'), Player('Jess'), Player('June')])
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_determinize(self):
+        engine = new_game(Player('John'))
+        observer = engine.current_player
+        state = determinize(engine, observer.name, random.Random(1))
+        before = {player.name: player.mask for player in engine.players}
+        after = {player.name: player.mask for player in state.players}
+        self.assertEqual(after[observer.name], before[observer.name])
+        self.assertEqual(sum(after.values()), sum(before.values()))
+        self.assertEqual({player.name: player.card_count() for player in state.players},
+                         {player.name: player.card_count() for player in engine.players})
+        # The real game is untouched.
+        self.assertEqual(before, {player.name: player.mask for player in engine.players})
+
+    def test_search(self):
+        engine = new_game(Player('John'))
+        visits = search(engine, budget_ms=1000, seed=2, max_iterations=50)
+        self.assertEqual(sum(visits.values()), 50)
+        legal = {move_key(move) for move in engine.legal_moves()}
+        self.assertLessEqual(set(visits), legal)
+
+    def test_plays_whole_game(self):
+        bot = MCTSPlayer('John', budget_ms=2, seed=3)
+        engine = new_game(bot)
+        rng = random.Random(3)
+        while not engine.is_over():
+            if engine.current_player is bot:
+                engine.apply(bot.choose(engine))
+            else:
+                engine.apply(rng.choice(engine.legal_moves()))
+        self.assertEqual(len(engine.finishing_order()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from itertools import combinations
+from random import Random
+
+from card import Card, CardPlay, CARDS
+from moves import legal_moves
+from validation import verify_combination, is_higher
+
+
+def brute_force(hand, previous_move=None):
+    plays = set()
+    for size in (1, 2, 3, 5):
+        for cards in combinations(sorted(hand), size):
+            valid, combotype = verify_combination(list(cards))
+            if not valid:
+                continue
+            card_play = CardPlay(combotype, list(cards))
+            if previous_move is None or is_higher(card_play, previous_move):
+                plays.add((combotype, frozenset(cards)))
+    return plays
+
+
+class TestLegalMoves(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = Random(52)
+        for _ in range(20):
+            hand = rng.sample(CARDS, 13)
+            generated = [(p.combotype, frozenset(p.cards)) for p in legal_moves(hand)]
+            self.assertEqual(len(generated), len(set(generated)))
+            self.assertEqual(set(generated), brute_force(hand))
+
+    def test_higher_than_previous_move(self):
+        rng = Random(7)
+        previous_moves = [CardPlay('Single', [Card('Hearts', 'Jack')]),
+                          CardPlay('Pair', [Card('Clubs', '8'), Card('Diamonds', '8')]),
+                          CardPlay('Straight', [Card('Clubs', '5'), Card('Hearts', '6'),
+                                                Card('Clubs', '7'), Card('Clubs', '8'),
+                                                Card('Spades', '9')])]
+        for _ in range(10):
+            hand = rng.sample(CARDS, 13)
+            for previous_move in previous_moves:
+                generated = {(p.combotype, frozenset(p.cards))
+                             for p in legal_moves(hand, previous_move)}
+                expected = brute_force(hand, previous_move)
+                self.assertEqual(generated, expected)
+
+    def test_required_card(self):
+        hand = [Card('Clubs', '3'), Card('Spades', '3'), Card('Hearts', '4')]
+        plays = list(legal_moves(hand, required=Card('Clubs', '3')))
+        self.assertEqual([p.combotype for p in plays], ['Single', 'Pair'])
+
+    def test_play_order(self):
+        hand = [Card('Clubs', '9'), Card('Spades', '9'), Card('Clubs', '4'),
+                Card('Hearts', '4'), Card('Spades', '4')]
+        full_house, = (p for p in legal_moves(hand) if p.combotype == 'Full house')
+        self.assertEqual(full_house.cards[-1], Card('Hearts', '4'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from functools import lru_cache
+from random import Random
+
+from card import Card, CARDS
+from moves import legal_moves
+from partition import Planner, partition
+from rules import RuleSet
+
+
+def fewest_plays(hand):
+    """Fewest plays that use every card, by trying every play."""
+    @lru_cache(maxsize=None)
+    def search(cards):
+        if not cards:
+            return 0
+        return min(1 + search(cards - frozenset(card_play.cards))
+                   for card_play in legal_moves(cards) if min(cards) in card_play.cards)
+    return search(frozenset(hand))
+
+
+class TestPartition(unittest.TestCase):
+
+    def test_fewest_plays(self):
+        rng = Random(21)
+        for _ in range(30):
+            hand = rng.sample(CARDS, 9)
+            plays = partition(hand)
+            self.assertEqual(sorted(card for card_play in plays for card in card_play.cards),
+                             sorted(hand))
+            self.assertEqual(len(plays), fewest_plays(hand))
+
+    def test_prefers_fewer_singles(self):
+        # Two three of a kinds rather than a full house and a single.
+        hand = [Card(suit, value) for value in ('5', '9') for suit in ('Clubs', 'Spades', 'Hearts')]
+        combotypes = [card_play.combotype for card_play in partition(hand)]
+        self.assertEqual(combotypes, ['Three of a kind', 'Three of a kind'])
+        hand += [Card('Diamonds', '5'), Card('Diamonds', '9')]
+        combotypes = [card_play.combotype for card_play in partition(hand)]
+        self.assertEqual(combotypes, ['Four of a kind', 'Three of a kind'])
+
+    def test_planner(self):
+        hand = Random(3).sample(CARDS, 13)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'partitions')
+            with Planner(path) as planner:
+                plays = planner.plan(hand)
+                self.assertEqual(planner.plan(list(reversed(hand))), plays)
+                self.assertEqual((planner.hits, planner.misses), (1, 1))
+            with Planner(path) as planner:
+                stored = planner.plan(hand)
+                self.assertEqual((planner.hits, planner.misses), (1, 0))
+            self.assertEqual([(p.combotype, p.cards) for p in stored],
+                             [(p.combotype, p.cards) for p in plays])
+
+    def test_planner_rules(self):
+        rules = RuleSet(wrap=True)
+        # Ace 2 3 4 5 is a straight only when straights wrap.
+        hand = [Card('Clubs', 'Ace'), Card('Spades', '2'), Card('Hearts', '3'),
+                Card('Diamonds', '4'), Card('Clubs', '5')]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'partitions')
+            with Planner(path) as planner:
+                self.assertEqual(len(planner.plan(hand)), 5)
+                self.assertEqual([p.combotype for p in planner.plan(hand, rules)], ['Straight'])
+                self.assertEqual((planner.hits, planner.misses), (0, 2))
+            with Planner(path) as planner:
+                stored = planner.plan(hand, rules)
+                self.assertEqual([p.combotype for p in stored], ['Straight'])
+                self.assertEqual(stored[0].strength, rules.play_strength('Straight', hand))
+                self.assertEqual(len(planner.plan(hand)), 5)
+                self.assertEqual((planner.hits, planner.misses), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
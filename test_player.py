@@ -0,0 +1,102 @@
+import copy
+import unittest
+
+from random import Random
+
+from bitmask import from_cards
+from card import Card, CardPlay, CARDS
+from player import Player, ActivePlayer, HandIndex
+
+
+class TestActivePlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.names = ['John', 'Jane', 'Jess', 'June', 'Jack', 'Jill']
+        self.players = ActivePlayer(*(Player(name) for name in self.names))
+
+    def turns(self, count):
+        return [self.players.next_turn().name for _ in range(count)]
+
+    def test_rotation(self):
+        self.assertEqual(self.turns(8), self.names + self.names[:2])
+        self.assertEqual(self.players.get_first().name, 'John')
+        self.assertEqual(self.players.get_last().name, 'Jill')
+
+    def test_remove(self):
+        self.turns(3)
+        self.assertTrue(self.players.remove(Player('Jess')))
+        self.assertFalse(self.players.remove(Player('Jess')))
+        self.assertEqual(self.players.get_size(), 5)
+        self.assertNotIn(Player('Jess'), self.players)
+        self.assertIn(Player('June'), self.players)
+        # The turn moves on to the player after the removed one.
+        self.assertEqual(self.turns(6), ['June', 'Jack', 'Jill', 'John', 'Jane', 'June'])
+        self.players.remove(Player('John'))
+        self.assertEqual(self.players.get_first().name, 'Jane')
+        self.assertEqual([player.name for player in self.players],
+                         ['Jane', 'June', 'Jack', 'Jill'])
+
+    def test_assign_control(self):
+        self.assertEqual(self.players.assign_control(Player('Jack')).name, 'Jack')
+        self.assertEqual(self.turns(2), ['Jill', 'John'])
+        # Iterating does not move the turn.
+        list(self.players)
+        self.assertEqual(self.turns(1), ['Jane'])
+
+    def test_copy(self):
+        self.turns(2)
+        other = copy.copy(self.players)
+        other.remove(Player('Jess'))
+        self.assertEqual(self.players.get_size(), 6)
+        self.assertEqual(other.next_turn().name, 'June')
+        self.assertEqual(self.players.next_turn().name, 'Jess')
+
+
+class TestHandIndex(unittest.TestCase):
+
+    def test_matches_rescan(self):
+        rng = Random(16)
+        index = HandIndex()
+        held = set()
+        for _ in range(200):
+            card = rng.choice(CARDS)
+            if card in held:
+                self.assertTrue(index.remove(card))
+                held.discard(card)
+            else:
+                index.add(card)
+                held.add(card)
+            self.assertEqual(index.cards, sorted(held))
+            self.assertEqual(index.mask, from_cards(held))
+            for rank in range(13):
+                self.assertEqual(index.rank_counts[rank],
+                                 sum(card.id >> 2 == rank for card in held))
+            for suit in range(4):
+                self.assertEqual(index.cards_of_suit(suit),
+                                 sorted(card for card in held if card.id & 3 == suit))
+
+    def test_lookups(self):
+        index = HandIndex([Card(suit, value) for suit, value in [
+            ('Clubs', '3'), ('Spades', '3'), ('Hearts', '3'), ('Clubs', '4'),
+            ('Hearts', '5'), ('Clubs', '6'), ('Clubs', '7'), ('Clubs', '9'),
+            ('Diamonds', '9')]])
+        self.assertEqual(index.ranks_with(2), [0, 6])
+        self.assertEqual(index.ranks_with(3), [0])
+        self.assertEqual(index.flush_suits(), [0])
+        self.assertEqual(index.cards_of_rank(6), [Card('Clubs', '9'), Card('Diamonds', '9')])
+        self.assertFalse(index.remove(Card('Spades', '4')))
+
+    def test_player_hand(self):
+        player = Player('John')
+        player.set_hand([CARDS[9], CARDS[0], CARDS[5]])
+        self.assertEqual(player.hand, (CARDS[0], CARDS[5], CARDS[9]))
+        other = player.copy()
+        player.play(CardPlay('Single', [CARDS[5]]))
+        self.assertEqual(player.hand, (CARDS[0], CARDS[9]))
+        self.assertEqual(other.card_count(), 3)
+        with self.assertRaises(ValueError):
+            player.play(CardPlay('Single', [CARDS[5]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from random import Random
+
+from card import CardPlay, CARDS
+from engine import GameEngine, PASS
+from player import Player
+from policies import POLICIES, greedy_policy
+
+
+def ids(card_play):
+    return sorted(card.id for card in card_play.cards)
+
+
+def new_game():
+    # Seat 1 holds the 3 of Clubs in a straight and a flush; seat 2 holds
+    # higher straights and a flush.
+    first = [0, 5, 10, 15, 16, 24, 25, 30, 32, 37, 42, 47, 48]
+    second = [3, 4, 8, 11, 12, 17, 22, 23, 26, 31, 33, 36, 43]
+    rest = [id_ for id_ in range(len(CARDS)) if id_ not in first + second]
+    hands = [first, second, rest[:13], rest[13:]]
+    players = [Player(f'Seat {seat + 1}') for seat in range(4)]
+    return GameEngine(players, hands=[[CARDS[id_] for id_ in hand] for hand in hands])
+
+
+class TestGreedyPolicy(unittest.TestCase):
+
+    def test_lead(self):
+        engine = new_game()
+        # The largest plays holding the 3 of Clubs are a straight and a
+        # flush; the straight is the lower.
+        move = greedy_policy(engine, engine.legal_moves(), Random(0))
+        self.assertEqual(move.combotype, 'Straight')
+        self.assertEqual(ids(move), [0, 5, 10, 15, 16])
+
+    def test_answer(self):
+        engine = new_game()
+        engine.apply(CardPlay('Straight', [CARDS[id_] for id_ in (0, 5, 10, 15, 16)]))
+        self.assertFalse(engine.has_control())
+        # The lowest play that beats the straight topped by the 7 of Clubs:
+        # 3 to 7 topped by the 7 of Spades.
+        move = greedy_policy(engine, engine.legal_moves(), Random(0))
+        self.assertEqual(move.combotype, 'Straight')
+        self.assertEqual(ids(move), [3, 4, 8, 12, 17])
+
+    def test_pass(self):
+        engine = new_game()
+        self.assertIs(greedy_policy(engine, [PASS], Random(0)), PASS)
+
+    def test_policies_play_legal_moves(self):
+        for name, policy in POLICIES.items():
+            if name == 'mcts':
+                continue
+            engine = new_game()
+            rng = Random(1)
+            while not engine.is_over():
+                moves = engine.legal_moves()
+                move = policy(engine, moves, rng)
+                self.assertIn(move, moves, name)
+                engine.apply(move)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import subprocess
+import sys
+import unittest
+
+import render
+from card import Card, CardPlay, CARDS
+
+
+class TestRender(unittest.TestCase):
+
+    def test_tables(self):
+        for theme in render.THEMES:
+            table = render.table(theme)
+            self.assertEqual(len(table), 52)
+            self.assertEqual(len(set(table)), 52)
+        self.assertEqual(render.card(Card('Diamonds', '2'), 'ascii'), 'D 2')
+        self.assertEqual(render.card(Card('Clubs', '3'), 'plain'), '♣ 3')
+        self.assertIn('\x1b[', render.card(Card('Hearts', 'Ace'), 'color'))
+        self.assertRaises(ValueError, render.table, 'sepia')
+
+    def test_play(self):
+        card_play = CardPlay('Pair', [Card('Clubs', '3'), Card('Spades', '3')])
+        self.assertEqual(render.play(card_play, 'ascii'), 'Pair of C 3-S 3')
+        self.assertEqual(str(card_play), render.play(card_play))
+        self.assertEqual(CARDS[0].show(display=False, theme='ascii'), 'C 3')
+
+    def test_set_theme(self):
+        theme = render.get_theme()
+        try:
+            render.set_theme('ascii')
+            self.assertEqual(render.cards(CARDS[:2]), 'C 3-S 3')
+            self.assertRaises(ValueError, render.set_theme, 'sepia')
+        finally:
+            render.set_theme(theme)
+
+    def test_frame(self):
+        writes = []
+        stream = io.StringIO()
+        stream.write = lambda text, write=stream.write: writes.append(text) or write(text)
+        with render.Frame(stream) as frame:
+            frame.print('Cards on hand:', 2)
+            frame.print('a', 'b', sep='-', end='')
+        self.assertEqual(writes, ['Cards on hand: 2\na-b'])
+
+    def test_headless_does_not_import_colorama(self):
+        code = 'import sys, engine, simulate; sys.exit("colorama" in sys.modules)'
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
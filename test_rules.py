@@ -0,0 +1,145 @@
+import unittest
+from itertools import combinations
+from random import Random
+
+import validation
+from card import Card, CardPlay, CARDS
+from engine import GameEngine
+from moves import legal_moves
+from player import Player
+from policies import greedy_policy
+from rules import RuleSet, STANDARD
+from validation import verify_combination, is_higher, is_straight
+
+VARIANTS = [RuleSet(wrap=True, name='wrap'),
+            RuleSet(two_in_straight=False, name='no twos in straights'),
+            RuleSet(rank_order=('2', '3', '4', '5', '6', '7', '8', '9', '10',
+                                'Jack', 'Queen', 'King', 'Ace'),
+                    suit_order=('Diamonds', 'Hearts', 'Spades', 'Clubs'),
+                    five_card_order=('Straight', 'Full house', 'Flush',
+                                     'Four of a kind', 'Straight flush'),
+                    name='aces high')]
+
+
+def cards_of(*names):
+    return [Card(suit, value) for suit, value in names]
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def test_standard_strength_matches_card_play(self):
+        rng = Random(25)
+        for _ in range(50):
+            hand = rng.sample(CARDS, 13)
+            for card_play in legal_moves(hand):
+                # The tables give the standard game's own strengths.
+                self.assertEqual(STANDARD._play_strength(card_play.combotype, card_play.cards),
+                                 card_play.strength, card_play)
+
+    def test_standard_verify_matches_validation(self):
+        rng = Random(7)
+        for _ in range(2000):
+            cards = rng.sample(CARDS, rng.choice((1, 2, 3, 5)))
+            self.assertEqual(STANDARD.verify(cards), verify_combination(cards), cards)
+
+    def test_wrap(self):
+        low = cards_of(('Clubs', 'Ace'), ('Spades', '2'), ('Hearts', '3'),
+                       ('Diamonds', '4'), ('Clubs', '5'))
+        self.assertEqual(is_straight(low), (False, 'Straight'))
+        rules = RuleSet(wrap=True)
+        self.assertEqual(is_straight(low, rules), (True, 'Straight'))
+        self.assertEqual(verify_combination(low, rules), (True, 'Straight'))
+        # A wrapped straight is ranked by its last card.
+        high = cards_of(('Clubs', '4'), ('Spades', '5'), ('Hearts', '6'),
+                        ('Diamonds', '7'), ('Clubs', '8'))
+        self.assertTrue(is_higher(CardPlay('Straight', high), CardPlay('Straight', low), rules))
+
+    def test_two_in_straight(self):
+        cards = cards_of(('Clubs', 'Jack'), ('Spades', 'Queen'), ('Hearts', 'King'),
+                         ('Diamonds', 'Ace'), ('Clubs', '2'))
+        self.assertEqual(verify_combination(cards), (True, 'Straight'))
+        self.assertEqual(verify_combination(cards, RuleSet(two_in_straight=False)), (False, None))
+
+    def test_suit_order(self):
+        rules = RuleSet(suit_order=('Diamonds', 'Hearts', 'Spades', 'Clubs'))
+        diamond = CardPlay('Single', [Card('Diamonds', '9')])
+        club = CardPlay('Single', [Card('Clubs', '9')])
+        self.assertTrue(is_higher(diamond, club))
+        self.assertFalse(is_higher(diamond, club, rules))
+        self.assertTrue(is_higher(club, diamond, rules))
+
+    def test_five_card_order(self):
+        rules = RuleSet(five_card_order=('Straight', 'Full house', 'Flush',
+                                         'Four of a kind', 'Straight flush'))
+        flush = CardPlay('Flush', cards_of(('Hearts', '3'), ('Hearts', '6'), ('Hearts', '8'),
+                                           ('Hearts', 'Jack'), ('Hearts', 'King')))
+        full_house = CardPlay('Full house', cards_of(('Clubs', '4'), ('Spades', '4'),
+                                                     ('Hearts', '4'), ('Clubs', '9'),
+                                                     ('Spades', '9')))
+        self.assertTrue(is_higher(full_house, flush))
+        self.assertFalse(is_higher(full_house, flush, rules))
+        self.assertTrue(is_higher(flush, full_house, rules))
+
+    def test_legal_moves(self):
+        rng = Random(11)
+        for rules in VARIANTS:
+            for _ in range(5):
+                hand = sorted(rng.sample(CARDS, 13))
+                expected = set()
+                for size in (1, 2, 3, 5):
+                    for cards in combinations(hand, size):
+                        valid, combotype = verify_combination(list(cards), rules)
+                        if valid:
+                            expected.add((combotype, frozenset(cards)))
+                moves = list(legal_moves(hand, rules=rules))
+                self.assertEqual({(move.combotype, frozenset(move.cards)) for move in moves},
+                                 expected, rules)
+                self.assertEqual(len(moves), len(expected))
+                previous_move = rng.choice(moves)
+                higher = {(move.combotype, frozenset(move.cards)) for move in moves
+                          if is_higher(move, previous_move, rules)}
+                self.assertEqual({(move.combotype, frozenset(move.cards))
+                                  for move in legal_moves(hand, previous_move, rules=rules)},
+                                 higher, rules)
+
+    def test_variant_game(self):
+        rules = VARIANTS[0]
+        for seed in range(5):
+            players = [Player(name) for name in ('John', 'Jane', 'Jess', 'June')]
+            engine = GameEngine(players, rng=seed, rules=rules)
+            rng = Random(seed)
+            while not engine.is_over():
+                # apply checks every move under the variant.
+                engine.apply(greedy_policy(engine, engine.legal_moves(), rng))
+        wrapped = cards_of(('Clubs', 'Ace'), ('Spades', '2'), ('Hearts', '3'),
+                           ('Diamonds', '4'), ('Clubs', '5'))
+        self.assertIn('Straight', [move.combotype for move in legal_moves(wrapped, rules=rules)])
+        self.assertNotIn('Straight', [move.combotype for move in legal_moves(wrapped)])
+
+    def test_default_rules(self):
+        cards = cards_of(('Clubs', 'Jack'), ('Spades', 'Queen'), ('Hearts', 'King'),
+                         ('Diamonds', 'Ace'), ('Clubs', '2'))
+        try:
+            validation.DEFAULT_RULES = RuleSet(two_in_straight=False)
+            self.assertEqual(verify_combination(cards), (False, None))
+            self.assertNotIn('Straight', [move.combotype for move in legal_moves(cards)])
+        finally:
+            validation.DEFAULT_RULES = STANDARD
+        self.assertEqual(verify_combination(cards), (True, 'Straight'))
+
+    def test_keys(self):
+        self.assertEqual(STANDARD.key, 'standard')
+        self.assertEqual(RuleSet(wrap=True).key, VARIANTS[0].key)
+        self.assertEqual(len({rules.key for rules in VARIANTS + [STANDARD]}), 4)
+
+    def test_invalid_orders(self):
+        with self.assertRaises(ValueError):
+            RuleSet(rank_order=('3', '4'))
+        with self.assertRaises(ValueError):
+            RuleSet(suit_order=('Clubs', 'Clubs', 'Hearts', 'Spades'))
+        with self.assertRaises(ValueError):
+            RuleSet(five_card_order=('Straight', 'Flush'))
+
+
+if __name__ == '__main__':
+    unittest.main()
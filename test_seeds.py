@@ -0,0 +1,30 @@
+import random
+import unittest
+
+from seeds import as_rng, derive_seed, game_rng
+
+
+class TestSeeds(unittest.TestCase):
+
+    def test_derive_seed(self):
+        self.assertEqual(derive_seed(42, 7, 'play'), derive_seed(42, 7, 'play'))
+        seeds = {derive_seed(42, game, 'play') for game in range(1000)}
+        self.assertEqual(len(seeds), 1000)
+        self.assertNotEqual(derive_seed(42, 7, 'play'), derive_seed(43, 7, 'play'))
+        self.assertNotEqual(derive_seed(42, 7, 'play'), derive_seed(42, 7, 'deal'))
+        self.assertLess(derive_seed(42, 7), 2 ** 64)
+
+    def test_game_rng(self):
+        first = [game_rng(1, 5).random() for _ in range(2)]
+        self.assertEqual(first[0], first[1])
+        self.assertNotEqual(game_rng(1, 5).random(), game_rng(1, 6).random())
+
+    def test_as_rng(self):
+        self.assertIs(as_rng(), random)
+        self.assertEqual(as_rng(3).random(), random.Random(3).random())
+        rng = random.Random(3)
+        self.assertIs(as_rng(rng), rng)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import time
+import unittest
+
+import loadgen
+from server import Connection, Server, Table, parse_play
+
+
+class StalledTransport:
+
+    def __init__(self, lost):
+        self.lost = lost
+
+    def abort(self):
+        if not self.lost.done():
+            self.lost.set_exception(ConnectionResetError('Connection lost'))
+
+
+class StalledWriter:
+    """A stream writer to a client that never reads: drain waits until aborted."""
+
+    def __init__(self):
+        self.lost = asyncio.get_running_loop().create_future()
+        self.transport = StalledTransport(self.lost)
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(data)
+
+    async def drain(self):
+        await asyncio.shield(self.lost)
+
+    def close(self):
+        pass
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = Server(move_timeout=0.5)
+        self.listener = await asyncio.start_server(self.server.handle, '127.0.0.1', 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_games(self):
+        stats = loadgen.Stats()
+        stop_at = time.perf_counter()
+        await asyncio.wait_for(asyncio.gather(
+            *(loadgen.seat('127.0.0.1', self.port, f'Bot{i}', stats, stop_at) for i in range(8))), 10)
+        self.assertEqual(self.server.games, 2)
+        self.assertEqual(stats.games, 2)
+        self.assertEqual(stats.moves, self.server.moves)
+        self.assertEqual(stats.errors, 0)
+
+    async def test_refuses_bad_moves(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(b'PASS\nJOIN John\nJOIN John\nHELLO\n')
+        lines = [(await reader.readline()).decode().strip() for _ in range(4)]
+        self.assertEqual(lines, ['ERR Not seated.', 'SEAT 0 0', 'ERR Already seated.',
+                                 'ERR Unknown command HELLO.'])
+        writer.close()
+        self.assertRaises(ValueError, parse_play, '0,52')
+        self.assertRaises(ValueError, parse_play, '0,4')
+
+    async def test_timeout_fallback(self):
+        self.server.seats_per_table = 2
+        self.server.move_timeout = 0.2
+        clients = [await asyncio.open_connection('127.0.0.1', self.port) for _ in range(2)]
+        reader = clients[0][0]
+        clients[0][1].write(b'JOIN Bot0\n')
+        self.assertEqual((await reader.readline()).decode().strip(), 'SEAT 0 0')
+        clients[1][1].write(b'JOIN Bot1\n')
+        self.assertTrue((await reader.readline()).startswith(b'DEAL '))
+        seat = (await reader.readline()).decode().split()[1]
+        # Nobody moves: the server leads for the seat with the 3 of Clubs.
+        self.assertEqual((await reader.readline()).decode().strip(), f'TIMEOUT {seat}')
+        move = (await reader.readline()).decode().split()
+        self.assertEqual(move[:2], ['MOVE', seat])
+        self.assertIn('0', move[2].split(','))
+        for _, writer in clients:
+            writer.close()
+        # Seats that left are moved for at once, so the game ends.
+        while not self.server.games:
+            await asyncio.sleep(0.01)
+
+    async def test_slow_client_is_dropped(self):
+        writer = StalledWriter()
+        connection = Connection(None, writer, queue_size=1, send_timeout=0.05)
+        await connection.send('TURN 0 -')   # taken by the sender, stuck draining
+        await connection.send('TURN 1 -')   # fills the queue
+        self.assertFalse(connection.closed)
+        await asyncio.wait_for(connection.send('TURN 2 -'), 1)
+        self.assertTrue(connection.closed)
+        self.assertTrue(writer.lost.done())
+        await asyncio.wait_for(connection.close(), 1)
+        self.assertEqual(writer.lines, [b'TURN 0 -\n'])
+
+    async def test_discard_moves(self):
+        table = Table(self.server, 0)
+        for entry in [(1, 'PASS'), (2, 'PLAY 0'), (1, None), (1, 'PLAY 4'), (3, 'PASS')]:
+            table.moves.put_nowait(entry)
+        table.discard_moves(1)
+        remaining = [table.moves.get_nowait() for _ in range(table.moves.qsize())]
+        self.assertEqual(remaining, [(2, 'PLAY 0'), (1, None), (3, 'PASS')])
+
+    async def test_failed_table_is_logged(self):
+        self.server.seats_per_table = 2
+        clients = [await asyncio.open_connection('127.0.0.1', self.port) for _ in range(2)]
+        reader, writer = clients[0]
+        writer.write(b'JOIN Bot0\n')
+        self.assertEqual((await reader.readline()).decode().strip(), 'SEAT 0 0')
+        table = self.server.tables[0]
+
+        async def fail():
+            raise RuntimeError('table failed')
+        table.run = fail
+        with self.assertLogs('server', 'ERROR') as logs:
+            clients[1][1].write(b'JOIN Bot1\n')
+            self.assertEqual((await reader.readline()).decode().strip(), 'ERR Table failed.')
+        self.assertIn('Table 0 failed', logs.output[0])
+        self.assertNotIn(table.id, self.server.tables)
+        # Its clients are free to play at another table.
+        writer.write(b'JOIN Bot0\n')
+        self.assertEqual((await reader.readline()).decode().strip(), 'SEAT 1 0')
+        for _, writer in clients:
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
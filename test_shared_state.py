@@ -0,0 +1,74 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+from engine import GameEngine
+from player import Player
+from policies import greedy_policy
+from shared_state import SharedBatch, evaluate, greedy_playout, legal_move_count
+
+
+def played_games(count, seed):
+    rng = Random(seed)
+    games = []
+    for game in range(count):
+        players = [Player(name) for name in ('John', 'Jane', 'Jess', 'June')]
+        engine = GameEngine(players, rng=game)
+        for _ in range(rng.randrange(60)):
+            if engine.is_over():
+                break
+            engine.apply(greedy_policy(engine, engine.legal_moves(), rng))
+        games.append((engine, players))
+    return games
+
+
+class TestSharedBatch(unittest.TestCase):
+
+    def test_round_trip(self):
+        games = played_games(40, 1)
+        with SharedBatch.create(len(games)) as batch:
+            for row, (engine, players) in enumerate(games):
+                batch.write(row, engine, players)
+            for row, (engine, players) in enumerate(games):
+                copy = batch.to_engine(row)
+                self.assertEqual(copy.is_over(), engine.is_over())
+                self.assertEqual(copy.pass_count, engine.pass_count)
+                self.assertEqual(copy.first_turn, engine.first_turn)
+                self.assertEqual(len(copy.winners), len(engine.winners))
+                self.assertEqual(str(copy.previous_move), str(engine.previous_move))
+                if not engine.is_over():
+                    self.assertEqual(copy.has_control(), engine.has_control())
+                    self.assertEqual(copy.current_player.hand, engine.current_player.hand)
+                    self.assertEqual([str(move) for move in copy.legal_moves()],
+                                     [str(move) for move in engine.legal_moves()])
+
+    def test_evaluate(self):
+        games = [(engine, players) for engine, players in played_games(30, 2)
+                 if not engine.is_over()]
+        with SharedBatch.create(len(games)) as batch:
+            for row, (engine, players) in enumerate(games):
+                batch.write(row, engine, players)
+            with ProcessPoolExecutor(2) as executor:
+                places = evaluate(batch, 'greedy_playout', executor, chunk_size=8)
+            self.assertEqual(places.tolist(),
+                             [greedy_playout(engine.copy()) for engine, _ in games])
+
+    def test_legal_move_count(self):
+        games = played_games(40, 4)
+        with SharedBatch.create(len(games)) as batch:
+            for row, (engine, players) in enumerate(games):
+                batch.write(row, engine, players)
+            expected = [0 if engine.is_over() else len(engine.legal_moves()) for engine, _ in games]
+            self.assertEqual([legal_move_count(batch, row) for row in range(len(games))], expected)
+            with ProcessPoolExecutor(2) as executor:
+                counts = evaluate(batch, 'legal_moves', executor, chunk_size=16)
+            self.assertEqual(counts.tolist(), expected)
+
+    def test_wrong_seats(self):
+        engine, players = played_games(1, 3)[0]
+        with SharedBatch.create(1, seats=3) as batch:
+            self.assertRaises(ValueError, batch.write, 0, engine, players)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from simulate import replay_game, run_batch, seat_policies, simulate
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_seat_policies(self):
+        self.assertEqual(seat_policies(['a', 'b', 'c'], 0, 4), ['a', 'b', 'c', 'a'])
+        self.assertEqual(seat_policies(['a', 'b', 'c'], 1, 4), ['b', 'c', 'a', 'b'])
+        self.assertEqual(seat_policies(['a', 'b'], 3, 2), ['b', 'a'])
+
+    def test_run_batch(self):
+        games, moves, winning_seats, per_policy = run_batch(['greedy', 'random'], 4, 3, 0, 10)
+        self.assertEqual(games, 10)
+        self.assertGreater(moves, 0)
+        self.assertEqual(sum(winning_seats.values()), 10)
+        # Two policies rotating through four seats sit in two seats each game.
+        self.assertEqual([stats['seats'] for stats in per_policy.values()], [20, 20])
+        self.assertEqual(sum(stats['wins'] for stats in per_policy.values()), 10)
+        self.assertEqual(sum(stats['losses'] for stats in per_policy.values()), 10)
+        self.assertEqual(sum(stats['place_total'] for stats in per_policy.values()),
+                         10 * (1 + 2 + 3 + 4))
+        for stats in per_policy.values():
+            self.assertLessEqual(stats['wins'] + stats['losses'], stats['seats'])
+
+    def test_replay(self):
+        _, _, winning_seats, _ = run_batch(['greedy', 'random'], 4, 3, 7, 1)
+        names, order, _ = replay_game(['greedy', 'random'], 4, 3, 7)
+        self.assertEqual(names, ['random', 'greedy', 'random', 'greedy'])
+        self.assertEqual(dict(winning_seats), {order[0]: 1})
+
+    def test_chunk_size(self):
+        results = [simulate(['greedy', 'random'], 12, seats=4, workers=2, chunk_size=chunk_size,
+                            seed=9)
+                   for chunk_size in (5, 12)]
+        for key in ('seed', 'games', 'moves', 'winning_seats', 'policies'):
+            self.assertEqual(results[0][key], results[1][key], key)
+        self.assertEqual(results[0]['games'], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from card import Card, CARDS
+from engine import GameEngine
+from player import Player
+from solver import EndgameSolver, WIN, LOSS
+
+
+def new_game(hands):
+    players = [Player(name) for name in ('John', 'Jane', 'Jess', 'June')]
+    return GameEngine(players, hands=hands)
+
+
+def brute_force(engine, root):
+    """Paranoid minimax over full engine copies."""
+    values = []
+    for move in engine.legal_moves():
+        state = engine.copy()
+        mover = state.current_player.name
+        state.apply(move)
+        if state.winners and state.winners[-1].name == mover:
+            values.append(WIN if mover == root else LOSS)
+        else:
+            values.append(brute_force(state, root))
+    if engine.current_player.name == root:
+        return max(values)
+    return min(values)
+
+
+class TestEndgameSolver(unittest.TestCase):
+
+    def test_keeps_control(self):
+        engine = new_game([[Card('Clubs', '3'), Card('Diamonds', '3'), Card('Spades', '5')],
+                           [Card('Clubs', '4')], [Card('Diamonds', '4')], [Card('Hearts', '4')]])
+        value, move = EndgameSolver().solve(engine)
+        self.assertEqual(value, WIN)
+        self.assertEqual(move.combotype, 'Pair')
+
+    def test_matches_brute_force(self):
+        rng = random.Random(12)
+        solver = EndgameSolver(max_entries=500)
+        for _ in range(15):
+            cards = [CARDS[0]] + rng.sample(CARDS[1:], 9)
+            rng.shuffle(cards)
+            hands = [cards[0:3], cards[3:5], cards[5:8], cards[8:10]]
+            engine = new_game(hands)
+            root = engine.current_player.name
+            value, move = solver.solve(engine)
+            self.assertEqual(value, brute_force(engine, root))
+            engine.apply(move)
+        self.assertLessEqual(len(solver.table), 500)
+        self.assertTrue(solver.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import math
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from tournament import (INITIAL_RATING, Tournament, arrangements, entrant_names,
+                        performance_rating, rating_error)
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_entrants(self):
+        self.assertEqual(entrant_names(['greedy', 'random', 'random', 'random']),
+                         ['greedy', 'random', 'random-2', 'random-3'])
+        self.assertEqual(len(arrangements(['a', 'b', 'c', 'd'], 4)), 24)
+        self.assertEqual(len(arrangements(['a', 'b', 'c'], 2)), 6)
+        self.assertRaises(ValueError, arrangements, ['a', 'b'], 3)
+
+    def test_performance_rating(self):
+        self.assertEqual(performance_rating([0, 0]), INITIAL_RATING)
+        self.assertEqual(performance_rating([10, 0]), math.inf)
+        self.assertEqual(performance_rating([0, 10]), -math.inf)
+        self.assertEqual(performance_rating([5, 0, 5]), INITIAL_RATING)
+        # Three pairings won for each lost.
+        self.assertAlmostEqual(performance_rating([75, 25]), INITIAL_RATING + 400 * math.log10(3))
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tournament.json')
+            with ProcessPoolExecutor(2) as executor:
+                whole = Tournament(['greedy', 'random', 'random'], 3, seed=5)
+                for _ in range(3):
+                    whole.play_round(executor)
+
+                Tournament(['greedy', 'random', 'random'], 3, seed=5,
+                           checkpoint=path).play_round(executor)
+                resumed = Tournament(['greedy', 'random', 'random'], 3, checkpoint=path)
+                self.assertEqual(resumed.rounds, 1)
+                for _ in range(2):
+                    resumed.play_round(executor)
+            self.assertEqual(resumed.ratings(), whole.ratings())
+            self.assertEqual(resumed.places, whole.places)
+            self.assertEqual(os.listdir(directory), ['tournament.json'])
+            self.assertRaises(ValueError, Tournament, ['greedy', 'random'], 2, checkpoint=path)
+            # Nor can a resumed run change how it stops.
+            self.assertRaises(ValueError, Tournament, ['greedy', 'random', 'random'], 3,
+                              tolerance=5.0, checkpoint=path)
+
+    def test_rating_error(self):
+        self.assertEqual(rating_error([0, 0]), math.inf)
+        self.assertEqual(rating_error([10, 0, 0]), math.inf)
+        # Half of 100 games won, with a sample variance of 25 / 99 a game.
+        self.assertAlmostEqual(rating_error([50, 50]), 400 / math.log(10) * 4 * math.sqrt(1 / 396))
+        self.assertLess(rating_error([200, 200]), rating_error([50, 50]))
+        self.assertLess(rating_error([50, 50]), rating_error([90, 10]))
+
+    def test_converges(self):
+        tournament = Tournament(['greedy', 'random', 'random', 'random'], 4, seed=1,
+                                tolerance=100.0, patience=2)
+        tournament.run(50, workers=1)
+        self.assertTrue(tournament.converged())
+        self.assertLessEqual(3 * tournament.gap_error(), 100.0)
+        standings = tournament.standings()
+        self.assertEqual(standings[0][0], 'greedy')
+
+    def test_identical_bots_finish_within_tolerance(self):
+        tournament = Tournament(['random'] * 4, 4, seed=0, tolerance=50.0)
+        tournament.run(100, workers=2)
+        self.assertTrue(tournament.converged())
+        ratings = tournament.ratings().values()
+        self.assertLessEqual(max(ratings) - min(ratings), 50.0)
+
+    def test_identical_bots_need_many_games(self):
+        tournament = Tournament(['random', 'random'], 2, seed=2)
+        tournament.run(16, workers=1)
+        self.assertFalse(tournament.converged())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -221,6 +221,24 @@ class TestPusoyDos(unittest.TestCase):
         self.assertFalse(is_higher(single1, pair1))
         self.assertFalse(is_higher(triple1, quad1))
 
+    def test_is_higher_ignores_card_order(self):
+        full_house1 = CardPlay('Full house', [Card('Hearts', '2'),
+                                              Card('Spades', '9'),
+                                              Card('Clubs', '2'),
+                                              Card('Diamonds', '9'),
+                                              Card('Spades', '2')])
+        full_house2 = CardPlay('Full house', [Card('Clubs', 'Ace'),
+                                              Card('Spades', 'Ace'),
+                                              Card('Hearts', 'Ace'),
+                                              Card('Clubs', '3'),
+                                              Card('Diamonds', '3')])
+        self.assertTrue(is_higher(full_house1, full_house2))
+        self.assertFalse(is_higher(full_house2, full_house1))
+        pair1 = CardPlay('Pair', [Card('Diamonds', '5'), Card('Clubs', '5')])
+        pair2 = CardPlay('Pair', [Card('Hearts', '5'), Card('Spades', '5')])
+        self.assertTrue(is_higher(pair1, pair2))
+        self.assertEqual(sorted([pair1, pair2], key=lambda p: p.strength), [pair2, pair1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,5 @@
+"""Helpers shared by the test modules."""
+
+from main import greedy_script
+
+__all__ = ['greedy_script']
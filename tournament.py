@@ -0,0 +1,272 @@
+"""Round-robin tournament between bot policies.
+
+Every round plays each seat arrangement of the entrants once: each
+ordered choice of entrants for the seats of a table, so every entrant
+meets every other from every seat. Games are played by simulate.play_game
+(the usual GameEngine seat ring, with the 3 of Clubs holder opening) on a
+process pool, each from its own random streams of the master seed.
+
+Entrants are rated by their score against the field: each game counts as
+one pairing won against every entrant finishing behind and lost against
+every one ahead. A score s of the pairings gives the performance rating
+1500 + 400 log10(s / (1 - s)), the Elo difference at which s is the
+expected score (see performance_rating).
+
+Progress is checkpointed to a JSON file after every round, replacing it
+atomically, and a run started with the same checkpoint resumes where it
+stopped. The tournament ends early once, for patience rounds in a row,
+the gap between any two ratings is known to within the tolerance, in Elo
+points: three standard errors of the gap (see rating_error) are at most
+the tolerance, so entrants of equal strength end up within it.
+
+    python tournament.py --policies greedy random mcts --seats 3 --checkpoint t.json
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+
+from policies import POLICIES
+from seeds import game_rng, new_master_seed
+from simulate import deal_games, play_game
+
+INITIAL_RATING = 1500.0
+CHECKPOINT_VERSION = 3
+
+
+def entrant_names(policy_names):
+    """Unique entrant names; repeats of a policy are numbered (greedy, greedy-2, ...)."""
+    names = []
+    for policy_name in policy_names:
+        name, copies = policy_name, 1
+        while name in names:
+            copies += 1
+            name = f'{policy_name}-{copies}'
+        names.append(name)
+    return names
+
+
+def arrangements(entrants, seats):
+    """Every seating of seats of the entrants, as tuples of entrant indices."""
+    if len(entrants) < seats:
+        raise ValueError(f'{len(entrants)} entrants cannot fill {seats} seats')
+    return list(permutations(range(len(entrants)), seats))
+
+
+def _pairings_won(places):
+    """Pairings won in a game at each place, first place first."""
+    seats = len(places)
+    return [seats - 1 - place for place in range(seats)]
+
+
+def performance_rating(places):
+    """Rating implied by an entrant's finishing places (game counts by place,
+    first place first); infinite while every pairing is won or lost.
+    """
+    pairings = sum(places) * (len(places) - 1)
+    wins = sum(count * won for count, won in zip(places, _pairings_won(places)))
+    if pairings == 0:
+        return INITIAL_RATING
+    if wins in (0, pairings):
+        return math.inf if wins else -math.inf
+    score = wins / pairings
+    return INITIAL_RATING + 400 * math.log10(score / (1 - score))
+
+
+def rating_error(places):
+    """Standard error, in Elo points, of performance_rating(places).
+
+    The pairings of one game are not independent, so the error of the
+    score comes from how much the pairings won vary from game to game.
+    """
+    games = sum(places)
+    won = _pairings_won(places)
+    if games < 2:
+        return math.inf
+    mean = sum(count * w for count, w in zip(places, won)) / games
+    score = mean / (len(places) - 1)
+    if not 0 < score < 1:
+        return math.inf
+    variance = sum(count * (w - mean) ** 2 for count, w in zip(places, won)) / (games - 1)
+    score_error = math.sqrt(variance / games) / (len(places) - 1)
+    # d/ds of 400 log10(s / (1 - s)).
+    return 400 / math.log(10) / (score * (1 - score)) * score_error
+
+
+def play_games(policy_names, seats, seed, games):
+    """Play (game index, seating) pairs; return each game's entrants in finishing order."""
+    results = []
+    for game_index, seating in games:
+        names = [policy_names[entrant] for entrant in seating]
+        hands, = deal_games(seed, [game_index], seats)
+        order, _ = play_game(names, game_rng(seed, game_index), hands)
+        results.append((game_index, [seating[seat] for seat in order]))
+    return results
+
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, state):
+    """Write state to path atomically: a crash leaves the old or the new checkpoint."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tournament-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class Tournament:
+    """A resumable tournament; see the module docstring."""
+
+    def __init__(self, policy_names, seats=4, seed=None, tolerance=25.0, patience=3,
+                 checkpoint=None):
+        for policy_name in policy_names:
+            if policy_name not in POLICIES:
+                raise ValueError(f'Unknown policy {policy_name!r}')
+        self.policy_names = list(policy_names)
+        self.entrants = entrant_names(policy_names)
+        self.seats = seats
+        self.arrangements = arrangements(self.entrants, seats)
+        self.tolerance = tolerance
+        self.patience = patience
+        self.checkpoint = checkpoint
+        self.seed = new_master_seed() if seed is None else seed
+        self.rounds = 0
+        self.stable_rounds = 0
+        self.places = {entrant: [0] * seats for entrant in self.entrants}
+        if checkpoint is not None:
+            state = load_checkpoint(checkpoint)
+            if state is not None:
+                self._restore(state, seed)
+
+    def _restore(self, state, seed):
+        if state.get('version') != CHECKPOINT_VERSION or state['policies'] != self.policy_names \
+                or state['seats'] != self.seats or seed not in (None, state['seed']):
+            raise ValueError(f'{self.checkpoint} is a checkpoint of a different tournament')
+        if (state['tolerance'], state['patience']) != (self.tolerance, self.patience):
+            raise ValueError(f'{self.checkpoint} was played with '
+                             f'tolerance={state["tolerance"]}, patience={state["patience"]}')
+        self.seed = state['seed']
+        self.rounds = state['rounds']
+        self.stable_rounds = state['stable_rounds']
+        self.places = state['places']
+
+    def state(self):
+        return {'version': CHECKPOINT_VERSION,
+                'policies': self.policy_names,
+                'seats': self.seats,
+                'seed': self.seed,
+                'tolerance': self.tolerance,
+                'patience': self.patience,
+                'rounds': self.rounds,
+                'games': self.rounds * len(self.arrangements),
+                'stable_rounds': self.stable_rounds,
+                'places': self.places}
+
+    def converged(self):
+        return self.stable_rounds >= self.patience
+
+    def play_round(self, executor, chunk_size=50):
+        """Play every arrangement once."""
+        first_game = self.rounds * len(self.arrangements)
+        games = list(enumerate(self.arrangements, first_game))
+        futures = [executor.submit(play_games, self.policy_names, self.seats, self.seed,
+                                   games[i:i + chunk_size])
+                   for i in range(0, len(games), chunk_size)]
+        for future in futures:
+            for _, order in future.result():
+                for place, entrant in enumerate(order):
+                    self.places[self.entrants[entrant]][place] += 1
+        self.rounds += 1
+        settled = self.gap_error() * 3 <= self.tolerance
+        self.stable_rounds = self.stable_rounds + 1 if settled else 0
+        if self.checkpoint is not None:
+            save_checkpoint(self.checkpoint, self.state())
+
+    def run(self, max_rounds, workers=None, chunk_size=50, progress=None):
+        """Play rounds until converged or max_rounds have been played in total."""
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while self.rounds < max_rounds and not self.converged():
+                self.play_round(executor, chunk_size)
+                if progress is not None:
+                    progress(self)
+        return self.standings()
+
+    def ratings(self):
+        """Performance rating of each entrant, by entrant; see performance_rating."""
+        return {name: performance_rating(self.places[name]) for name in self.entrants}
+
+    def errors(self):
+        """Standard error of each entrant's rating, by entrant; see rating_error."""
+        return {name: rating_error(self.places[name]) for name in self.entrants}
+
+    def gap_error(self):
+        """Largest standard error of the gap between two entrants' ratings."""
+        largest, second = sorted(self.errors().values())[-2:]
+        # Scores against the field add up to a constant, so one entrant's
+        # luck is the others' bad luck: the gaps vary by n / (n - 1) more.
+        entrants = len(self.entrants)
+        return math.hypot(largest, second) * math.sqrt(entrants / (entrants - 1))
+
+    def standings(self):
+        """(entrant, rating, places) from the highest rating down."""
+        ratings = self.ratings()
+        return sorted(((name, ratings[name], self.places[name]) for name in self.entrants),
+                      key=lambda standing: -standing[1])
+
+
+def report(tournament):
+    state = 'converged' if tournament.converged() else 'not converged'
+    print(f'Master seed {tournament.seed}, {tournament.rounds} rounds, '
+          f'{tournament.rounds * len(tournament.arrangements)} games ({state})')
+    errors = tournament.errors()
+    for name, rating, places in tournament.standings():
+        print(f'  {name:12} {rating:7.1f} +-{errors[name]:5.1f}  places '
+              + ' '.join(f'{count:6}' for count in places))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--policies', nargs='+', default=['greedy', 'random', 'random', 'random'],
+                        choices=sorted(POLICIES))
+    parser.add_argument('--seats', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=200, help='most rounds to play in total')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=50)
+    parser.add_argument('--seed', type=int, help='master seed (default: a fresh one)')
+    parser.add_argument('--tolerance', type=float, default=25.0,
+                        help='rating gap, in Elo, within which entrants count as equal')
+    parser.add_argument('--patience', type=int, default=3,
+                        help='settled rounds in a row before stopping')
+    parser.add_argument('--checkpoint', help='JSON file to save progress to and resume from')
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(args.policies, args.seats, args.seed, args.tolerance, args.patience,
+                            args.checkpoint)
+
+    def progress(tournament):
+        print(f'Round {tournament.rounds}: rating gaps known to '
+              f'+-{3 * tournament.gap_error():.1f}')
+
+    tournament.run(args.rounds, args.workers, args.chunk_size, progress)
+    report(tournament)
+
+
+if __name__ == '__main__':
+    main()